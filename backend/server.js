@@ -19,6 +19,10 @@ app.post('/api/recommender', async (req, res) => {
   }
 });
 
+app.get('/api/recommender/stats', (req, res) => {
+  res.json({ resultCache: recommend.cacheStats() });
+});
+
 app.listen(3000, () => {
   console.log('🚀 Servidor rodando na porta 3000');
 });
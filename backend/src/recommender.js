@@ -1,29 +1,93 @@
 const fs = require('fs');
 const path = require('path');
+const http = require('http');
 const axios = require('axios');
-const cosineSimilarity = require('./utils/cosineSimilarity.js');
-const { getTfidfSimilarities } = require('./utils/tfidf.js');
+const { TFIDF_VECTORS_PATH, loadTfidf, vectorizeQuerySparse } = require('./utils/tfidf.js');
+const { createHybridScorer } = require('./utils/hybridScorer.js');
+const { ResultCache, normalizeQuery } = require('./utils/resultCache.js');
+const { readArtifact, artifactChecksum } = require('./utils/artifact.js');
+const { formatMovie } = require('./utils/formatMovie.js');
 
 const DEBUG = false;
-const TMDB_BASE_URL = 'https://image.tmdb.org/t/p/w154';
 const EMBEDDING_API_URL = 'http://127.0.0.1:5000/embed';
 const EMBEDDING_TIMEOUT_MS = 5000;
-const MODEL_PATH = path.join(__dirname, '../../data/model/model.json');
+// EMBEDDING_MODEL escolhe um modelo do registro (scripts/nlp/model_registry.py): o artefato
+// vem de data/model/<nome>/model.json e as consultas pedem o mesmo modelo ao serviço.
+// O modelo padrão do registro fica em data/model/model.json, como artifact_path() no Python.
+const DEFAULT_EMBEDDING_MODEL = 'minilm';
+const EMBEDDING_MODEL = process.env.EMBEDDING_MODEL || null;
+const MODEL_PATH = EMBEDDING_MODEL && EMBEDDING_MODEL !== DEFAULT_EMBEDDING_MODEL
+  ? path.join(__dirname, '../../data/model', EMBEDDING_MODEL, 'model.json')
+  : path.join(__dirname, '../../data/model/model.json');
 const SIMILARITY_THRESHOLD = 0.3;
 const WEIGHT_MINILM = 0.7;
 const WEIGHT_TFIDF = 0.3;
+const CACHE_MAX_ENTRIES = 1000;
+const CACHE_TTL_MS = 10 * 60 * 1000;
+const MODEL_WATCH_INTERVAL_MS = 5000;
+
+// Reaproveita a conexão TCP com o serviço de embedding entre consultas
+const embeddingAgent = new http.Agent({ keepAlive: true, maxSockets: 16 });
+
+function loadModel() {
+  // Confere o hash de cada seção antes de trocar o modelo em uso (MODEL_VERIFY=skip desliga)
+  const model = readArtifact(MODEL_PATH);
+  const tfidf = loadTfidf();
+
+  // O serviço de embedding pode servir vários modelos; pede sempre o do artefato
+  const modelName = model.metadata?.model_name || DEFAULT_EMBEDDING_MODEL;
+  if (EMBEDDING_MODEL && modelName !== EMBEDDING_MODEL) {
+    throw new Error(`${MODEL_PATH} foi gerado com '${modelName}', mas EMBEDDING_MODEL=${EMBEDDING_MODEL}`);
+  }
+
+  return {
+    movies: model.movies,
+    modelName,
+    tfidf,
+    // Matriz contígua de embeddings + índice TF-IDF, pontuados numa única passada
+    scorer: createHybridScorer({
+      embeddings: model.embeddings,
+      tfidfIndex: tfidf.tfidfIndex,
+      weightDense: WEIGHT_MINILM,
+      weightSparse: WEIGHT_TFIDF
+    }),
+    modelChecksum: artifactChecksum(model, MODEL_PATH),
+    tfidfChecksum: tfidf.checksum
+  };
+}
 
-let model;
+let state;
 try {
-  model = JSON.parse(fs.readFileSync(MODEL_PATH, 'utf-8'));
+  state = loadModel();
 } catch (err) {
   console.error('Erro ao carregar o modelo:', err.message);
   throw err;
 }
 
-const { movies } = model;
-// Converter embeddings para Float32Array para performance
-const embeddings = model.embeddings.map(e => Float32Array.from(e));
+// Resultados (índices + scores) por consulta normalizada, checksums dos dois artefatos e n
+const resultCache = new ResultCache({ maxEntries: CACHE_MAX_ENTRIES, ttlMs: CACHE_TTL_MS });
+
+// Recarrega modelo e TF-IDF juntos quando qualquer um dos artefatos muda em disco.
+// Se só um foi reconstruído (ex.: contagem de filmes diferente), a carga falha e
+// é refeita quando o outro chegar; checksum novo invalida o cache.
+function reloadOnChange(curr, prev) {
+  if (curr.mtimeMs === prev.mtimeMs) return;
+  try {
+    const next = loadModel();
+    if (next.modelChecksum !== state.modelChecksum || next.tfidfChecksum !== state.tfidfChecksum) {
+      state = next;
+      resultCache.clear();
+      console.log(`Modelo recarregado (checksums ${state.modelChecksum} / ${state.tfidfChecksum}); ` +
+        'cache de resultados invalidado');
+    }
+  } catch (err) {
+    console.error('Erro ao recarregar o modelo, mantendo o atual:', err.message);
+  }
+}
+
+for (const artifactPath of [MODEL_PATH, TFIDF_VECTORS_PATH]) {
+  fs.watchFile(artifactPath, { interval: MODEL_WATCH_INTERVAL_MS }, reloadOnChange).unref();
+}
 
 
 function validateQuery(query) {
@@ -32,92 +96,97 @@ function validateQuery(query) {
   }
 }
 
-function validateEmbedding(vector) {
+function validateEmbedding(vector, dim) {
   if (!Array.isArray(vector) && !(vector instanceof Float32Array)) {
     throw new Error(`Formato de embedding inválido. Tipo: ${typeof vector}`);
   }
   if (vector.length === 0) {
     throw new Error('Embedding vazio');
   }
+  if (vector.length !== dim) {
+    throw new Error(`Embedding com ${vector.length} dimensões, modelo com ${dim}`);
+  }
 }
 
-async function getEmbedding(query) {
+// float32 little-endian cru -> Float32Array (cópia para garantir alinhamento de 4 bytes)
+function decodeFloat32(buffer) {
+  if (buffer.length === 0 || buffer.length % 4 !== 0) {
+    throw new Error(`Resposta binária inválida (${buffer.length} bytes)`);
+  }
+  const vector = new Float32Array(buffer.length / 4);
+  new Uint8Array(vector.buffer).set(buffer);
+  return vector;
+}
+
+async function getEmbedding(query, modelName) {
   const response = await axios.post(
     EMBEDDING_API_URL,
-    { text: query },
+    { text: query, model: modelName },
     {
       timeout: EMBEDDING_TIMEOUT_MS,
-      headers: { 'Content-Type': 'application/json' }
+      httpAgent: embeddingAgent,
+      responseType: 'arraybuffer',
+      headers: {
+        'Content-Type': 'application/json',
+        // Binário evita formatar/parsear 384 floats em JSON; JSON fica como fallback
+        Accept: 'application/octet-stream, application/json;q=0.5'
+      }
     }
   );
 
-  if (!response?.data?.vector) {
+  const body = Buffer.from(response.data);
+  const contentType = response.headers['content-type'] || '';
+
+  if (contentType.startsWith('application/octet-stream')) {
+    return decodeFloat32(body);
+  }
+
+  const data = JSON.parse(body.toString('utf-8'));
+  if (!data?.vector) {
     throw new Error('Resposta do serviço de embedding está vazia');
   }
 
   // Converte vetor recebido para Float32Array para melhor performance
-  return Float32Array.from(response.data.vector);
+  return Float32Array.from(data.vector);
 }
 
-function processResults(queryVec, queryText, queryKeywords = '', queryGenres = '', n) {
-  const results = [];
-  const tfidfScores = getTfidfSimilarities(queryText, queryKeywords, queryGenres);
-
-  for (let i = 0; i < embeddings.length; i++) {
-    const simMiniLM = cosineSimilarity(queryVec, embeddings[i]);
-    const simTfidf = tfidfScores[i];
-
-    const similarity = (WEIGHT_MINILM * simMiniLM) + (WEIGHT_TFIDF * simTfidf);
-   /* console.log({
-    titulo: movies[i].title,
-    simMiniLM: simMiniLM.toFixed(4),
-    simTfidf: simTfidf.toFixed(4),
-    final: similarity.toFixed(4)
-    });*/
-
-    results.push({ index: i, similarity });
-  }
-
-
-
-  return results
-    .sort((a, b) => b.similarity - a.similarity)
-    .slice(0, n);
+function processResults({ scorer }, queryVec, queryTerms, queryKeywords = '', queryGenres = '', n) {
+  return scorer.topK(queryVec, queryTerms, n);
 }
 
-function formatMovie(movie, similarity) {
-  const splitAndTrim = (str) =>
-    typeof str === 'string'
-      ? str.split(',').map(s => s.trim()).filter(Boolean)
-      : [];
-
-
-
-  return {
-    id: movie.id,
-    title: movie.title,
-    overview: movie.overview || 'Sem descrição.',
-    genres: splitAndTrim(movie.genres),
-    keywords: splitAndTrim(movie.keywords),
-    similarity: Number(similarity.toFixed(4)),
-    poster: movie.poster ? `${TMDB_BASE_URL}${movie.poster}` : null,
-    popularity: movie.popularity,
-    rating: movie.rating,
-  };
-  
+// Termos TF-IDF da consulta em ordem de índice: o embedding depende do texto
+// normalizado, o TF-IDF da tokenização do texto bruto, e a chave cobre os dois
+function termsKey({ indices, values }) {
+  return Array.from(indices, (index, j) => [index, values[j]])
+    .sort((a, b) => a[0] - b[0])
+    .map(([index, value]) => `${index}:${value}`)
+    .join(',');
 }
 
 async function recommender(query, n = 5, keywords = '', genres = '') {
   try {
     validateQuery(query);
 
-    const queryVec = await getEmbedding(query);
-    validateEmbedding(queryVec);
-
-    const topResults = processResults(queryVec, query, keywords, genres, n);
+    // O modelo pode ser trocado durante o await; a resposta usa sempre o mesmo estado
+    const current = state;
+    // Mesma tokenização do texto bruto de hybrid_scorer.py/sweep_hybrid.py
+    const queryTerms = vectorizeQuerySparse(current.tfidf, query);
+    const cacheKey = [
+      current.modelChecksum, current.tfidfChecksum, n,
+      normalizeQuery(query), termsKey(queryTerms), keywords, genres
+    ].join('\u0000');
+    let topResults = resultCache.get(cacheKey);
+
+    if (!topResults) {
+      const queryVec = await getEmbedding(query, current.modelName);
+      validateEmbedding(queryVec, current.scorer.dim);
+
+      topResults = processResults(current, queryVec, queryTerms, keywords, genres, n);
+      resultCache.set(cacheKey, topResults);
+    }
 
     return topResults.map(result =>
-      formatMovie(movies[result.index], result.similarity)
+      formatMovie(current.movies[result.index], result.similarity)
     );
   } catch (err) {
     console.error('\nErro no sistema de recomendação:');
@@ -134,4 +203,11 @@ async function recommender(query, n = 5, keywords = '', genres = '') {
   }
 }
 
+recommender.cacheStats = () => ({
+  ...resultCache.stats(),
+  modelName: state.modelName,
+  modelChecksum: state.modelChecksum,
+  tfidfChecksum: state.tfidfChecksum
+});
+
 module.exports = recommender;
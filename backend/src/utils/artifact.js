@@ -0,0 +1,54 @@
+const fs = require('fs');
+const crypto = require('crypto');
+
+// Artefatos gravados por scripts/nlp/artifact_io.py trazem em metadata.integrity
+// o offset, o tamanho e o blake2b (64 bytes) de cada seção do JSON.
+// MODEL_VERIFY=skip pula a conferência (ex.: reinícios frequentes em dev).
+const DEFAULT_VERIFY = process.env.MODEL_VERIFY || 'full';
+const HASH_ALGORITHMS = { blake2b: 'blake2b512' };
+
+function verifySections(buffer, integrity, filePath) {
+  const algorithm = HASH_ALGORITHMS[integrity.algorithm];
+  if (!algorithm) {
+    throw new Error(`${filePath}: algoritmo de hash desconhecido (${integrity.algorithm})`);
+  }
+  for (const [name, { offset, length, hash }] of Object.entries(integrity.sections)) {
+    if (offset + length > buffer.length) {
+      throw new Error(`${filePath}: seção '${name}' truncada`);
+    }
+    const digest = crypto
+      .createHash(algorithm)
+      .update(buffer.subarray(offset, offset + length))
+      .digest('hex');
+    if (digest !== hash) {
+      throw new Error(`${filePath}: hash da seção '${name}' não confere`);
+    }
+  }
+}
+
+function readArtifact(filePath, { verify = DEFAULT_VERIFY } = {}) {
+  if (verify !== 'full' && verify !== 'skip') {
+    throw new Error(`MODEL_VERIFY inválido: ${verify} (use full ou skip)`);
+  }
+  const buffer = fs.readFileSync(filePath);
+  const data = JSON.parse(buffer.toString('utf-8'));
+
+  // Artefatos antigos (sem integrity) continuam carregando sem conferência
+  const integrity = data.metadata?.integrity;
+  if (verify === 'full' && integrity) {
+    verifySections(buffer, integrity, filePath);
+  }
+  return data;
+}
+
+// Artefatos antigos sem checksum: tamanho + mtime identificam o arquivo
+function artifactChecksum(data, filePath) {
+  if (data.metadata?.checksum) return data.metadata.checksum;
+  const stat = fs.statSync(filePath);
+  return `${stat.size}-${stat.mtimeMs}`;
+}
+
+module.exports = {
+  readArtifact,
+  artifactChecksum
+};
@@ -0,0 +1,27 @@
+const TMDB_BASE_URL = 'https://image.tmdb.org/t/p/w154';
+
+// Resposta da API para um filme do modelo; fica fora de recommender.js para que
+// scripts/benchmark/scan_bench.js meça a mesma formatação sem carregar o modelo
+function formatMovie(movie, similarity) {
+  const splitAndTrim = (str) =>
+    typeof str === 'string'
+      ? str.split(',').map(s => s.trim()).filter(Boolean)
+      : [];
+
+  return {
+    id: movie.id,
+    title: movie.title,
+    overview: movie.overview || 'Sem descrição.',
+    genres: splitAndTrim(movie.genres),
+    keywords: splitAndTrim(movie.keywords),
+    similarity: Number(similarity.toFixed(4)),
+    poster: movie.poster ? `${TMDB_BASE_URL}${movie.poster}` : null,
+    popularity: movie.popularity,
+    rating: movie.rating,
+  };
+}
+
+module.exports = {
+  TMDB_BASE_URL,
+  formatMovie
+};
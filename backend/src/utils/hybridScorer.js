@@ -0,0 +1,171 @@
+// Kernel de pontuação híbrida: uma única passada sobre a matriz de embeddings
+// (contígua, linha a linha, linhas já normalizadas), somando a contribuição
+// TF-IDF acumulada via índice invertido e mantendo o top-k num min-heap fixo.
+
+// Min-heap de tamanho fixo: a raiz é o pior dos k melhores
+class TopKHeap {
+  constructor(k) {
+    this.k = k;
+    this.size = 0;
+    this.scores = new Float64Array(k);
+    this.indices = new Int32Array(k);
+  }
+
+  push(index, score) {
+    if (this.size < this.k) {
+      let i = this.size++;
+      // sobe
+      while (i > 0) {
+        const parent = (i - 1) >> 1;
+        if (this.scores[parent] <= score) break;
+        this.scores[i] = this.scores[parent];
+        this.indices[i] = this.indices[parent];
+        i = parent;
+      }
+      this.scores[i] = score;
+      this.indices[i] = index;
+      return;
+    }
+    if (score <= this.scores[0]) return;
+    // substitui a raiz e desce
+    let i = 0;
+    const n = this.size;
+    for (;;) {
+      const left = 2 * i + 1;
+      if (left >= n) break;
+      const right = left + 1;
+      const child = right < n && this.scores[right] < this.scores[left] ? right : left;
+      if (this.scores[child] >= score) break;
+      this.scores[i] = this.scores[child];
+      this.indices[i] = this.indices[child];
+      i = child;
+    }
+    this.scores[i] = score;
+    this.indices[i] = index;
+  }
+
+  // Resultado ordenado do maior para o menor
+  sorted() {
+    const out = [];
+    for (let i = 0; i < this.size; i++) {
+      out.push({ index: this.indices[i], similarity: this.scores[i] });
+    }
+    return out.sort((a, b) => b.similarity - a.similarity);
+  }
+}
+
+// Array de vetores -> Float32Array contígua (n x dim), com cada linha em norma 1
+function buildDenseMatrix(rows) {
+  const n = rows.length;
+  const dim = n > 0 ? rows[0].length : 0;
+  const data = new Float32Array(n * dim);
+
+  for (let i = 0; i < n; i++) {
+    const row = rows[i];
+    if (row.length !== dim) {
+      throw new Error(`Embedding ${i} com dimensão ${row.length}, esperado ${dim}`);
+    }
+    let norm = 0;
+    for (let j = 0; j < dim; j++) norm += row[j] * row[j];
+    // generate_model.py já normaliza; isto só protege contra modelos antigos
+    const inv = norm > 0 ? 1 / Math.sqrt(norm) : 0;
+    const offset = i * dim;
+    for (let j = 0; j < dim; j++) data[offset + j] = row[j] * inv;
+  }
+
+  return { data, n, dim };
+}
+
+// Vetores TF-IDF densos (doc x termo) -> índice invertido (termo -> docs),
+// com pesos já divididos pela norma do documento
+function buildInvertedIndex(docVectors, vocabSize) {
+  const counts = new Int32Array(vocabSize + 1);
+  const invNorms = new Float32Array(docVectors.length);
+
+  docVectors.forEach((doc, d) => {
+    let norm = 0;
+    for (let t = 0; t < vocabSize; t++) {
+      const w = doc[t];
+      if (w !== 0) {
+        counts[t + 1]++;
+        norm += w * w;
+      }
+    }
+    invNorms[d] = norm > 0 ? 1 / Math.sqrt(norm) : 0;
+  });
+
+  const offsets = new Int32Array(vocabSize + 1);
+  for (let t = 0; t < vocabSize; t++) offsets[t + 1] = offsets[t] + counts[t + 1];
+
+  const docIds = new Int32Array(offsets[vocabSize]);
+  const weights = new Float32Array(offsets[vocabSize]);
+  const cursor = offsets.slice(0, vocabSize);
+
+  docVectors.forEach((doc, d) => {
+    for (let t = 0; t < vocabSize; t++) {
+      const w = doc[t];
+      if (w !== 0) {
+        const pos = cursor[t]++;
+        docIds[pos] = d;
+        weights[pos] = w * invNorms[d];
+      }
+    }
+  });
+
+  return { offsets, docIds, weights, numDocs: docVectors.length };
+}
+
+function createHybridScorer({ embeddings, tfidfIndex, weightDense, weightSparse }) {
+  const matrix = buildDenseMatrix(embeddings);
+  if (tfidfIndex && tfidfIndex.numDocs !== matrix.n) {
+    throw new Error(`TF-IDF com ${tfidfIndex.numDocs} documentos, modelo com ${matrix.n} filmes`);
+  }
+  // Buffers reaproveitados entre consultas (sem alocação por filme)
+  const sparseScores = new Float32Array(matrix.n);
+  const query = new Float32Array(matrix.dim);
+
+  // queryTerms: { indices, values } com values já normalizados (norma 1)
+  function topK(queryVec, queryTerms, k, filter = null) {
+    const { data, n, dim } = matrix;
+    if (k <= 0 || n === 0) return [];
+    if (queryVec.length !== dim) {
+      throw new Error(`Consulta com dimensão ${queryVec.length}, esperado ${dim}`);
+    }
+
+    let norm = 0;
+    for (let j = 0; j < dim; j++) norm += queryVec[j] * queryVec[j];
+    const inv = norm > 0 ? weightDense / Math.sqrt(norm) : 0;
+    // peso denso embutido no vetor da consulta: score = <q', e> + sparse
+    for (let j = 0; j < dim; j++) query[j] = queryVec[j] * inv;
+
+    sparseScores.fill(0);
+    if (tfidfIndex && queryTerms) {
+      const { offsets, docIds, weights } = tfidfIndex;
+      for (let t = 0; t < queryTerms.indices.length; t++) {
+        const term = queryTerms.indices[t];
+        const qw = weightSparse * queryTerms.values[t];
+        for (let p = offsets[term]; p < offsets[term + 1]; p++) {
+          sparseScores[docIds[p]] += qw * weights[p];
+        }
+      }
+    }
+
+    const heap = new TopKHeap(Math.min(k, n));
+    for (let i = 0, offset = 0; i < n; i++, offset += dim) {
+      if (filter && !filter(i)) continue;
+      let dot = 0;
+      for (let j = 0; j < dim; j++) dot += data[offset + j] * query[j];
+      heap.push(i, dot + sparseScores[i]);
+    }
+    return heap.sorted();
+  }
+
+  return { topK, size: matrix.n, dim: matrix.dim };
+}
+
+module.exports = {
+  TopKHeap,
+  buildDenseMatrix,
+  buildInvertedIndex,
+  createHybridScorer
+};
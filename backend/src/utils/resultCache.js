@@ -0,0 +1,79 @@
+// Cache de resultados por consulta (TTL + LRU). A Map do JS preserva a ordem de
+// inserção, então reinserir na leitura mantém o item mais recente no fim.
+
+// Mesma limpeza de clean_text em scripts/nlp/embed_service.py. O \w do Python
+// cobre letras e dígitos Unicode, por isso \p{L}\p{N} com a flag u.
+function normalizeQuery(text) {
+  if (!text || typeof text !== 'string') return '';
+  return text
+    .trim()
+    .normalize('NFKC')
+    .replace(/[^\p{L}\p{N}_\sáéíóúÁÉÍÓÚâêîôÂÊÎÔãõÃÕçÇ-]/gu, '')
+    .split(/\s+/)
+    .filter(Boolean)
+    .join(' ');
+}
+
+class ResultCache {
+  constructor({ maxEntries = 1000, ttlMs = 10 * 60 * 1000, now = Date.now } = {}) {
+    this.maxEntries = maxEntries;
+    this.ttlMs = ttlMs;
+    this.now = now;
+    this.entries = new Map();
+    this.hits = 0;
+    this.misses = 0;
+    this.evictions = 0;
+    this.invalidations = 0;
+  }
+
+  get(key) {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      this.misses++;
+      return undefined;
+    }
+    if (entry.expiresAt <= this.now()) {
+      this.entries.delete(key);
+      this.misses++;
+      return undefined;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    this.hits++;
+    return entry.value;
+  }
+
+  set(key, value) {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: this.now() + this.ttlMs });
+    while (this.entries.size > this.maxEntries) {
+      // primeira chave = menos recentemente usada
+      this.entries.delete(this.entries.keys().next().value);
+      this.evictions++;
+    }
+  }
+
+  clear() {
+    this.entries.clear();
+    this.invalidations++;
+  }
+
+  stats() {
+    const lookups = this.hits + this.misses;
+    return {
+      size: this.entries.size,
+      maxEntries: this.maxEntries,
+      ttlMs: this.ttlMs,
+      hits: this.hits,
+      misses: this.misses,
+      evictions: this.evictions,
+      invalidations: this.invalidations,
+      hitRatio: lookups > 0 ? this.hits / lookups : 0
+    };
+  }
+}
+
+module.exports = {
+  ResultCache,
+  normalizeQuery
+};
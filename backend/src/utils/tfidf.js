@@ -1,11 +1,22 @@
-const fs = require('fs');
 const path = require('path');
-const cosineSimilarity = require('./cosineSimilarity.js');
+const { buildInvertedIndex } = require('./hybridScorer.js');
+const { readArtifact, artifactChecksum } = require('./artifact.js');
 
 const TFIDF_VECTORS_PATH = path.join(__dirname, '../../../data/model/tfidf_vectors.json');
-const tfidfData = JSON.parse(fs.readFileSync(TFIDF_VECTORS_PATH, 'utf-8'));
 
-const { vocabArray, idf, tfidfVectors } = tfidfData;
+// Só o índice invertido (termo -> documentos) fica em memória; as linhas densas
+// de tfidfVectors (uma por filme, com todo o vocabulário) são descartadas aqui.
+// Chamado a cada (re)carga do modelo em recommender.js.
+function loadTfidf(filePath = TFIDF_VECTORS_PATH) {
+  const data = readArtifact(filePath);
+  const { vocabArray, idf, tfidfVectors } = data;
+  return {
+    tfidfIndex: buildInvertedIndex(tfidfVectors, vocabArray.length),
+    termIndex: new Map(vocabArray.map((term, i) => [term, i])),
+    idf,
+    checksum: artifactChecksum(data, filePath)
+  };
+}
 
 function tokenize(text) {
   return text
@@ -20,29 +31,32 @@ function computeTF(tokens) {
   return tfMap;
 }
 
-// Calcula TF-IDF da query usando o IDF do corpus
-function vectorizeQuery(query) {
-  const tokens = tokenize(query);
-  const tfMap = computeTF(tokens);
-  const vec = vocabArray.map((term, i) => {
-    const tf = tfMap.get(term) || 0;
-    return tf * idf[i];
-  });
-  return vec;
-}
-
-function getTfidfSimilarities(query) {
-  const queryVec = vectorizeQuery(query);
-
-  // Normalizar queryVec (opcional, recomendado)
-  const mag = Math.sqrt(queryVec.reduce((acc, v) => acc + v * v, 0));
-  const normalizedQueryVec = mag > 0 ? queryVec.map(v => v / mag) : queryVec;
-
-  // Normalizar documentos? Supondo que tfidfVectors já estão normalizados (se não, normalizar aqui também)
-
-  return tfidfVectors.map(docVec => cosineSimilarity(normalizedQueryVec, docVec));
+// TF-IDF da query usando o IDF do corpus, só com os termos presentes e já normalizado
+function vectorizeQuerySparse({ termIndex, idf }, query) {
+  const tfMap = computeTF(tokenize(query));
+  const indices = [];
+  const values = [];
+  let mag = 0;
+
+  for (const [term, tf] of tfMap) {
+    const i = termIndex.get(term);
+    if (i === undefined) continue;
+    const value = tf * idf[i];
+    if (value === 0) continue;
+    indices.push(i);
+    values.push(value);
+    mag += value * value;
+  }
+
+  mag = Math.sqrt(mag);
+  return {
+    indices: Int32Array.from(indices),
+    values: Float32Array.from(values, v => (mag > 0 ? v / mag : 0))
+  };
 }
 
 module.exports = {
-  getTfidfSimilarities
+  TFIDF_VECTORS_PATH,
+  loadTfidf,
+  vectorizeQuerySparse
 };
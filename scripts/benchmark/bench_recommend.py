@@ -0,0 +1,252 @@
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import argparse
+import platform
+import subprocess
+import threading
+import urllib.request
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# === CONFIGURAÇÕES ===
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+CSV_INPUT = os.path.join(ROOT_DIR, 'data', 'results', 'inputs.csv')
+EMBED_SERVICE = os.path.join(ROOT_DIR, 'scripts', 'nlp', 'embed_service.py')
+SCAN_BENCH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scan_bench.js')
+HISTORY_FILE = os.path.join(ROOT_DIR, 'data', 'results', 'benchmarks', 'history.jsonl')
+USER_INPUT_COL = 'input_user'
+
+EMBED_PORT = 5000
+EMBEDDING_DIM = 384
+STARTUP_TIMEOUT_S = 300
+REQUEST_TIMEOUT_S = 30
+PERCENTILES = (50, 95, 99)
+SCALING_SIZES = [1000, 10000, 100000]
+
+# === STUB DO SERVIÇO DE EMBEDDING ===
+class StubEmbedHandler(BaseHTTPRequestHandler):
+    """Imita /embed com vetores determinísticos (hash do texto), sem carregar modelo"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        if self.path != '/embed':
+            self.send_error(404)
+            return
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        text = json.loads(body or b'{}').get('text', '')
+        if not text:
+            payload, status = {'error': 'Texto ausente'}, 400
+        else:
+            seed = int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+            vector = np.random.default_rng(seed).standard_normal(EMBEDDING_DIM).astype(np.float32)
+            payload, status = {'vector': (vector / np.linalg.norm(vector)).tolist()}, 200
+
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def start_stub(port):
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubEmbedHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# === UTILITÁRIOS ===
+def percentiles(samples_ms):
+    if len(samples_ms) == 0:
+        return {}
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    stats = {f'p{p}': float(np.percentile(arr, p)) for p in PERCENTILES}
+    stats.update({'mean': float(arr.mean()), 'min': float(arr.min()), 'max': float(arr.max()), 'n': int(arr.size)})
+    return stats
+
+def post_json(url, payload):
+    body = json.dumps(payload).encode('utf-8')
+    req = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=REQUEST_TIMEOUT_S) as resp:
+        return resp.read()
+
+def load_queries(limit=None):
+    df = pd.read_csv(CSV_INPUT, sep=",", quotechar='"', encoding="utf-8")
+    queries = [q for q in df[USER_INPUT_COL].astype(str).str.strip() if q and q.lower() != 'nan']
+    return queries[:limit] if limit else queries
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True,
+                              encoding='utf-8', check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def wait_for_port(port, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex(('127.0.0.1', port)) == 0:
+                return True
+        time.sleep(0.05)
+    return False
+
+# === BENCHMARKS ===
+def bench_cold_start(url, port):
+    """Tempo do processo do embed_service até a primeira resposta de /embed"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, EMBED_SERVICE], cwd=ROOT_DIR,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        if not wait_for_port(port, STARTUP_TIMEOUT_S):
+            return {'error': f'serviço não abriu a porta {port} em {STARTUP_TIMEOUT_S}s'}
+        listening_ms = (time.perf_counter() - start) * 1000
+        post_json(url, {'text': 'aquecimento'})
+        return {'listening_ms': listening_ms, 'first_response_ms': (time.perf_counter() - start) * 1000}
+    finally:
+        proc.terminate()
+        proc.wait()
+
+def bench_endpoint(url, payloads, concurrency):
+    """Latência por requisição e vazão com N clientes simultâneos"""
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def call(payload):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            post_json(url, payload)
+        except OSError:
+            with lock:
+                errors += 1
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(call, payloads))
+    wall = time.perf_counter() - wall_start
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(payloads),
+        'errors': errors,
+        'throughput_rps': len(latencies) / wall if wall > 0 else 0.0,
+        'latency_ms': percentiles(latencies),
+    }
+
+def bench_scan(movies, queries, dim=EMBEDDING_DIM, vocab=3000, k=5, fused=False):
+    """Quebra por etapa da varredura do backend (node), sobre catálogo sintético.
+
+    fused=False mede o caminho antigo (cosseno por filme + sort completo);
+    fused=True mede o kernel de hybridScorer.js.
+    """
+    cmd = ['node', '--max-old-space-size=8192', SCAN_BENCH, '--movies', str(movies), '--dim', str(dim),
+           '--vocab', str(vocab), '--queries', str(queries), '--k', str(k), '--fused', str(int(fused))]
+    kernel = 'fused' if fused else 'legacy'
+    try:
+        result = subprocess.run(cmd, capture_output=True, encoding='utf-8', check=True)
+    except FileNotFoundError:
+        return {'movies': movies, 'kernel': kernel, 'error': 'node não encontrado'}
+    except subprocess.CalledProcessError as e:
+        # Catálogos grandes podem estourar a memória do node: esse é justamente o ponto de quebra
+        last_line = (e.stderr or '').strip().splitlines()[-1:]
+        return {'movies': movies, 'kernel': kernel, 'error': last_line[0] if last_line else f'exit {e.returncode}'}
+
+    raw = json.loads(result.stdout)
+    return {
+        'movies': movies,
+        'kernel': kernel,
+        'build_ms': raw['build_ms'],
+        'rss_bytes': raw['rss_bytes'],
+        'stages_ms': {stage: percentiles(samples) for stage, samples in raw['stages_ms'].items()},
+    }
+
+# === HISTÓRICO ===
+def append_history(record, path=HISTORY_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de latência/vazão do caminho de recomendação')
+    parser.add_argument('--mode', choices=['stub', 'real'], default='stub',
+                        help='stub: /embed local sem modelo; real: sobe scripts/nlp/embed_service.py')
+    parser.add_argument('--port', type=int, default=EMBED_PORT)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--queries', type=int, default=200, help='máximo de consultas de inputs.csv')
+    parser.add_argument('--backend-url', default=None,
+                        help='ex.: http://127.0.0.1:3000/api/recommender para medir o fluxo completo')
+    parser.add_argument('--scaling', type=int, nargs='*', default=SCALING_SIZES)
+    parser.add_argument('--scan-queries', type=int, default=20)
+    parser.add_argument('--history', default=HISTORY_FILE)
+    args = parser.parse_args()
+
+    url = f'http://127.0.0.1:{args.port}/embed'
+    queries = load_queries(args.queries)
+    record = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': git_commit(),
+        'host': {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()},
+        'config': vars(args),
+        'results': {},
+    }
+
+    stub = None
+    proc = None
+    try:
+        if args.mode == 'stub':
+            stub = start_stub(args.port)
+        else:
+            print("Medindo cold start do embed_service...")
+            record['results']['cold_start'] = bench_cold_start(url, args.port)
+            proc = subprocess.Popen([sys.executable, EMBED_SERVICE], cwd=ROOT_DIR,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            if not wait_for_port(args.port, STARTUP_TIMEOUT_S):
+                raise RuntimeError(f'embed_service não subiu na porta {args.port}')
+
+        post_json(url, {'text': 'aquecimento'})
+        payloads = [{'text': q} for q in queries]
+        record['results']['embed'] = []
+        for c in args.concurrency:
+            print(f"/embed com concorrência {c}...")
+            record['results']['embed'].append(bench_endpoint(url, payloads, c))
+
+        if args.backend_url:
+            record['results']['recommend'] = []
+            for c in args.concurrency:
+                print(f"Fluxo completo com concorrência {c}...")
+                record['results']['recommend'].append(
+                    bench_endpoint(args.backend_url, [{'query': q} for q in queries], c))
+    finally:
+        if stub:
+            stub.shutdown()
+        if proc:
+            proc.terminate()
+            proc.wait()
+
+    record['results']['scaling'] = []
+    for n in args.scaling:
+        for fused in (False, True):
+            print(f"Varredura sintética com {n} filmes ({'kernel fundido' if fused else 'legado'})...")
+            record['results']['scaling'].append(bench_scan(n, args.scan_queries, fused=fused))
+
+    append_history(record, args.history)
+    print(json.dumps(record['results'], indent=2, ensure_ascii=False))
+    print(f"Resultado adicionado a {args.history}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+// Mede as etapas do caminho de recomendação (vetorização TF-IDF da consulta,
+// varredura densa, varredura TF-IDF, ordenação e formatação) sobre um catálogo
+// sintético, usando as funções do backend. Com --fused 1 mede o kernel de
+// hybridScorer.js (varreduras e ordenação numa única etapa 'score'). Saída: JSON
+// em stdout, consumido por bench_recommend.py.
+const { performance } = require('perf_hooks');
+const cosineSimilarity = require('../../backend/src/utils/cosineSimilarity.js');
+const { buildInvertedIndex, createHybridScorer } = require('../../backend/src/utils/hybridScorer.js');
+const { vectorizeQuerySparse } = require('../../backend/src/utils/tfidf.js');
+const { formatMovie } = require('../../backend/src/utils/formatMovie.js');
+
+const WEIGHT_MINILM = 0.7;
+const WEIGHT_TFIDF = 0.3;
+
+function parseArgs(argv) {
+  const args = { movies: 1000, dim: 384, vocab: 3000, queries: 50, k: 5, seed: 42, density: 0.01, fused: 0 };
+  for (let i = 2; i < argv.length; i += 2) {
+    const key = argv[i].replace(/^--/, '');
+    if (!(key in args)) throw new Error(`Argumento desconhecido: ${argv[i]}`);
+    args[key] = Number(argv[i + 1]);
+  }
+  return args;
+}
+
+// PRNG determinístico (mulberry32) para catálogos reproduzíveis entre execuções
+function makeRng(seed) {
+  let a = seed >>> 0;
+  return () => {
+    a = (a + 0x6D2B79F5) >>> 0;
+    let t = a;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+function randomUnitVector(rng, dim) {
+  const vec = new Float32Array(dim);
+  let norm = 0;
+  for (let i = 0; i < dim; i++) {
+    vec[i] = rng() * 2 - 1;
+    norm += vec[i] * vec[i];
+  }
+  norm = Math.sqrt(norm);
+  for (let i = 0; i < dim; i++) vec[i] /= norm;
+  return vec;
+}
+
+function randomTfidfRow(rng, vocab, density) {
+  // Mesmo formato de tfidf_vectors.json: linha densa, maioria zeros
+  const row = new Array(vocab).fill(0);
+  const nnz = Math.max(1, Math.round(vocab * density));
+  for (let j = 0; j < nnz; j++) row[Math.floor(rng() * vocab)] = rng();
+  return row;
+}
+
+function buildCatalog(args, rng) {
+  const embeddings = [];
+  const tfidfVectors = [];
+  const movies = [];
+  for (let i = 0; i < args.movies; i++) {
+    embeddings.push(randomUnitVector(rng, args.dim));
+    tfidfVectors.push(randomTfidfRow(rng, args.vocab, args.density));
+    movies.push({
+      id: i,
+      title: `Filme ${i}`,
+      overview: 'Sinopse sintética.',
+      genres: 'Drama, Comédia',
+      keywords: 'brasil, família',
+      poster: '/poster.jpg',
+      popularity: rng() * 100,
+      rating: rng() * 10,
+    });
+  }
+  return { embeddings, tfidfVectors, movies };
+}
+
+function timeStage(stages, name, fn) {
+  const start = performance.now();
+  const result = fn();
+  stages[name].push(performance.now() - start);
+  return result;
+}
+
+// Vocabulário sintético ('t0', 't1', ...) no formato que tfidf.loadTfidf devolve
+function buildTfidf(args, rng) {
+  const vocabArray = Array.from({ length: args.vocab }, (_, j) => `t${j}`);
+  return {
+    vocabArray,
+    termIndex: new Map(vocabArray.map((term, i) => [term, i])),
+    idf: vocabArray.map(() => 1 + rng() * 5)
+  };
+}
+
+function randomQueryText(rng, tfidf, terms = 10) {
+  const words = [];
+  for (let j = 0; j < terms; j++) {
+    words.push(tfidf.vocabArray[Math.floor(rng() * tfidf.vocabArray.length)]);
+  }
+  return `Um filme sobre ${words.join(' ')}, com família e amizade`;
+}
+
+// O caminho antigo comparava a consulta com cada linha densa do TF-IDF
+function toDense({ indices, values }, vocab) {
+  const vec = new Array(vocab).fill(0);
+  indices.forEach((i, j) => { vec[i] = values[j]; });
+  return vec;
+}
+
+function runFused(args, rng, catalog, tfidf, stages) {
+  const { embeddings, tfidfVectors, movies } = catalog;
+  const scorer = createHybridScorer({
+    embeddings,
+    tfidfIndex: buildInvertedIndex(tfidfVectors, args.vocab),
+    weightDense: WEIGHT_MINILM,
+    weightSparse: WEIGHT_TFIDF
+  });
+
+  for (let q = 0; q < args.queries; q++) {
+    const queryVec = randomUnitVector(rng, args.dim);
+    const queryText = randomQueryText(rng, tfidf);
+    const totalStart = performance.now();
+
+    // Mesma sequência de recommender.js/processResults
+    const queryTerms = timeStage(stages, 'vectorize', () => vectorizeQuerySparse(tfidf, queryText));
+    const top = timeStage(stages, 'score', () => scorer.topK(queryVec, queryTerms, args.k));
+    timeStage(stages, 'format', () => top.map(r => formatMovie(movies[r.index], r.similarity)));
+
+    stages.total.push(performance.now() - totalStart);
+  }
+}
+
+function run() {
+  const args = parseArgs(process.argv);
+  const rng = makeRng(args.seed);
+
+  const buildStart = performance.now();
+  const catalog = buildCatalog(args, rng);
+  const { embeddings, tfidfVectors, movies } = catalog;
+  const tfidf = buildTfidf(args, rng);
+  const buildMs = performance.now() - buildStart;
+
+  if (args.fused) {
+    const stages = { vectorize: [], score: [], format: [], total: [] };
+    runFused(args, rng, catalog, tfidf, stages);
+    return report(args, buildMs, stages);
+  }
+
+  const stages = { vectorize: [], dense_scan: [], tfidf_scan: [], sort: [], format: [], total: [] };
+
+  for (let q = 0; q < args.queries; q++) {
+    const queryVec = randomUnitVector(rng, args.dim);
+    const queryText = randomQueryText(rng, tfidf);
+    const totalStart = performance.now();
+
+    // Sequência anterior ao kernel fundido: vetor de consulta com todo o vocabulário
+    const queryTfidf = timeStage(stages, 'vectorize', () =>
+      toDense(vectorizeQuerySparse(tfidf, queryText), args.vocab));
+    const tfidfScores = timeStage(stages, 'tfidf_scan', () =>
+      tfidfVectors.map(docVec => cosineSimilarity(queryTfidf, docVec)));
+
+    const results = timeStage(stages, 'dense_scan', () => {
+      const out = [];
+      for (let i = 0; i < embeddings.length; i++) {
+        const similarity = (WEIGHT_MINILM * cosineSimilarity(queryVec, embeddings[i])) +
+          (WEIGHT_TFIDF * tfidfScores[i]);
+        out.push({ index: i, similarity });
+      }
+      return out;
+    });
+
+    const top = timeStage(stages, 'sort', () =>
+      results.sort((a, b) => b.similarity - a.similarity).slice(0, args.k));
+
+    timeStage(stages, 'format', () => top.map(r => formatMovie(movies[r.index], r.similarity)));
+
+    stages.total.push(performance.now() - totalStart);
+  }
+
+  return report(args, buildMs, stages);
+}
+
+function report(args, buildMs, stages) {
+  const memory = process.memoryUsage();
+  process.stdout.write(JSON.stringify({
+    config: args,
+    build_ms: buildMs,
+    heap_used_bytes: memory.heapUsed,
+    rss_bytes: memory.rss,
+    stages_ms: stages,
+  }));
+}
+
+run();
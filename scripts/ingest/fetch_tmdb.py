@@ -0,0 +1,286 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nlp'))
+from catalog import normalize_catalog, write_catalog, join_list, LIST_COLS, CSV_PATH, CATALOG_PATH
+
+# === CONFIGURAÇÕES ===
+ROOT_DIR = Path(__file__).resolve().parents[2]
+BASE_URL = os.environ.get('TMDB_BASE_URL', 'https://api.themoviedb.org/3')
+API_KEY = os.environ.get('TMDB_API_KEY', '')
+NDJSON_PATH = ROOT_DIR / 'data' / 'raw' / 'movies.ndjson'
+
+TOTAL_PAGES = 500
+RATE_PER_SECOND = 40      # abaixo do limite do TMDB (~50 req/s)
+BURST = 20
+CONCURRENCY = 16
+MAX_RETRIES = 5
+REQUEST_TIMEOUT_S = 20
+
+DISCOVER_PARAMS = {
+    'sort_by': 'popularity.desc',
+    'with_origin_country': 'BR',
+    'with_original_language': 'pt',
+    'language': 'pt-BR',
+}
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# === RATE LIMIT ===
+class TokenBucket:
+    """Libera até `rate` requisições por segundo, com rajadas de até `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# === PERSISTÊNCIA RETOMÁVEL ===
+class MovieStore:
+    """NDJSON append-only + índices de IDs e páginas concluídas em arquivos ao lado.
+
+    Cada filme é gravado antes do seu ID entrar no índice, então um ID
+    presente no índice sempre tem registro completo no NDJSON. Uma linha
+    incompleta no fim (processo morto no meio da escrita) é descartada ao abrir.
+    """
+
+    def __init__(self, ndjson_path):
+        self.path = Path(ndjson_path)
+        self.ids_path = self.path.with_suffix('.ids')
+        self.pages_path = self.path.with_suffix('.pages')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        for path in (self.path, self.ids_path, self.pages_path):
+            self._drop_partial_line(path)
+
+        self.ids = self._read_index(self.ids_path)
+        self.pages = self._read_index(self.pages_path)
+        self._data = open(self.path, 'a', encoding='utf-8')
+        self._ids_file = open(self.ids_path, 'a', encoding='utf-8')
+        self._pages_file = open(self.pages_path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def _drop_partial_line(path, block_size=1 << 16):
+        """Trunca o arquivo logo após o último '\\n'"""
+        if not path.exists():
+            return
+        with open(path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            pos = end
+            while pos > 0:
+                step = min(block_size, pos)
+                pos -= step
+                f.seek(pos)
+                cut = f.read(step).rfind(b'\n')
+                if cut >= 0:
+                    pos += cut + 1
+                    break
+            if pos < end:
+                logger.warning(f"{path}: descartando {end - pos} bytes de uma linha incompleta")
+                f.truncate(pos)
+
+    @staticmethod
+    def _read_index(path):
+        if not path.exists():
+            return set()
+        with open(path, encoding='utf-8') as f:
+            return {int(line) for line in f if line.strip()}
+
+    def has(self, movie_id):
+        return movie_id in self.ids
+
+    def add(self, movie):
+        if movie['id'] in self.ids:
+            return
+        self._data.write(json.dumps(movie, ensure_ascii=False) + '\n')
+        self._data.flush()
+        self._ids_file.write(f"{movie['id']}\n")
+        self._ids_file.flush()
+        self.ids.add(movie['id'])
+
+    def page_done(self, page):
+        self._pages_file.write(f'{page}\n')
+        self._pages_file.flush()
+        self.pages.add(page)
+
+    def close(self):
+        for f in (self._data, self._ids_file, self._pages_file):
+            f.close()
+
+# === CLIENTE TMDB ===
+def retry_delay(retry_after, attempt):
+    """Retry-After em segundos ou data HTTP; sem valor utilizável, backoff exponencial"""
+    backoff = 2 ** attempt
+    if not retry_after:
+        return backoff
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return backoff
+
+class TmdbClient:
+    def __init__(self, session, base_url, api_key, bucket):
+        self.session = session
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.bucket = bucket
+
+    async def get(self, path, **params):
+        """GET com rate limit e retentativas em 429/5xx (respeita Retry-After)"""
+        params = {'api_key': self.api_key, **params}
+        for attempt in range(MAX_RETRIES):
+            await self.bucket.acquire()
+            try:
+                async with self.session.get(f'{self.base_url}{path}', params=params) as resp:
+                    if resp.status == 429 or resp.status >= 500:
+                        delay = retry_delay(resp.headers.get('Retry-After'), attempt)
+                        logger.warning(f"{path}: HTTP {resp.status}, nova tentativa em {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    resp.raise_for_status()
+                    return await resp.json()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                logger.warning(f"{path}: {e!r}, nova tentativa")
+                await asyncio.sleep(2 ** attempt)
+        raise RuntimeError(f"{path}: desistindo após {MAX_RETRIES} tentativas")
+
+    async def discover(self, page):
+        data = await self.get('/discover/movie', page=page, **DISCOVER_PARAMS)
+        return data.get('results', []), data.get('total_pages', page)
+
+    async def details(self, movie_id):
+        data = await self.get(f'/movie/{movie_id}', language='pt-BR', append_to_response='keywords')
+        return {
+            'id': data['id'],
+            'title': data.get('title', ''),
+            'overview': data.get('overview', ''),
+            'genres': [g['name'] for g in data.get('genres', [])],
+            'keywords': [k['name'] for k in (data.get('keywords') or {}).get('keywords', [])],
+            'popularity': data.get('popularity'),
+            'rating': data.get('vote_average'),
+            'original_language': data.get('original_language', ''),
+            'poster': data.get('poster_path') or '',
+        }
+
+# === COLETA ===
+async def collect(base_url, api_key, total_pages, store, rate, concurrency):
+    bucket = TokenBucket(rate, BURST)
+    semaphore = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_S)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    stats = {'fetched': 0, 'skipped': 0, 'failed': 0, 'failed_pages': 0}
+
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        client = TmdbClient(session, base_url, api_key, bucket)
+
+        async def fetch_movie(movie_id):
+            async with semaphore:
+                try:
+                    store.add(await client.details(movie_id))
+                    stats['fetched'] += 1
+                except Exception as e:
+                    stats['failed'] += 1
+                    logger.error(f"Erro ao buscar o filme {movie_id}: {e}")
+
+        async def fetch_page(page, results=None):
+            if results is None:
+                async with semaphore:
+                    results, _ = await client.discover(page)
+            new_ids = [m['id'] for m in results if not store.has(m['id'])]
+            stats['skipped'] += len(results) - len(new_ids)
+            await asyncio.gather(*(fetch_movie(i) for i in new_ids))
+            # Página só é marcada concluída se todos os detalhes foram salvos
+            if all(store.has(i) for i in new_ids):
+                store.page_done(page)
+
+        # A página 1 informa quantas páginas o filtro realmente tem
+        first_results, available_pages = await client.discover(1)
+        last_page = min(total_pages, available_pages)
+        pending = [p for p in range(1, last_page + 1) if p not in store.pages]
+        logger.info(f"{len(pending)} de {last_page} páginas pendentes, {len(store.ids)} filmes já salvos")
+        outcomes = await asyncio.gather(
+            *(fetch_page(p, first_results if p == 1 else None) for p in pending),
+            return_exceptions=True
+        )
+        for page, outcome in zip(pending, outcomes):
+            if isinstance(outcome, Exception):
+                stats['failed_pages'] += 1
+                logger.error(f"Erro ao buscar a página {page}: {outcome}")
+
+    return stats
+
+# === EXPORTAÇÃO ===
+def export_catalog(ndjson_path, csv_path=CSV_PATH, parquet_path=CATALOG_PATH):
+    """NDJSON -> movies.csv (gêneros/keywords separados por vírgula) + catálogo Parquet"""
+    df = normalize_catalog(pd.read_json(ndjson_path, lines=True, dtype={'id': 'int64'}, precise_float=True))
+
+    csv_df = df.copy()
+    for col in LIST_COLS:
+        csv_df[col] = csv_df[col].map(join_list)
+    Path(csv_path).parent.mkdir(parents=True, exist_ok=True)
+    csv_df.to_csv(csv_path, index=False, encoding='utf-8')
+    logger.info(f"{len(df)} filmes exportados para {csv_path}")
+
+    write_catalog(df, parquet_path)
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description='Coleta assíncrona e retomável de filmes do TMDB')
+    parser.add_argument('--base-url', default=BASE_URL, help='ex.: http://127.0.0.1:8765 para o mock')
+    parser.add_argument('--api-key', default=API_KEY)
+    parser.add_argument('--pages', type=int, default=TOTAL_PAGES)
+    parser.add_argument('--rate', type=float, default=RATE_PER_SECOND, help='requisições por segundo')
+    parser.add_argument('--concurrency', type=int, default=CONCURRENCY)
+    parser.add_argument('--output', default=str(NDJSON_PATH))
+    parser.add_argument('--csv', default=str(CSV_PATH))
+    parser.add_argument('--parquet', default=str(CATALOG_PATH))
+    parser.add_argument('--skip-export', action='store_true')
+    args = parser.parse_args()
+
+    if not args.api_key:
+        parser.error('defina TMDB_API_KEY ou use --api-key')
+
+    store = MovieStore(args.output)
+    start = time.perf_counter()
+    try:
+        stats = asyncio.run(collect(args.base_url, args.api_key, args.pages, store,
+                                    args.rate, args.concurrency))
+    finally:
+        store.close()
+    logger.info(f"Coleta concluída em {time.perf_counter() - start:.1f}s: {stats}")
+
+    if not args.skip_export:
+        export_catalog(args.output, args.csv, args.parquet)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+import random
+import argparse
+
+from aiohttp import web
+
+# === CONFIGURAÇÕES ===
+PORT = 8765
+PAGES = 20
+PER_PAGE = 20
+GENRES = ['Drama', 'Comédia', 'Documentário', 'Romance', 'Crime', 'Animação', 'Terror']
+KEYWORDS = ['brasil', 'favela', 'família', 'ditadura', 'futebol', 'amizade', 'sertão', 'carnaval']
+
+def make_app(pages=PAGES, per_page=PER_PAGE, error_rate=0.0, seed=0):
+    """Imita /discover/movie e /movie/{id} do TMDB com dados determinísticos.
+
+    error_rate > 0 responde 429 (com Retry-After) numa fração das requisições,
+    para exercitar as retentativas do fetch_tmdb.py.
+    """
+    rng = random.Random(seed)
+    requests_seen = {'discover': 0, 'details': 0, 'throttled': 0}
+
+    def maybe_throttle():
+        if error_rate and rng.random() < error_rate:
+            requests_seen['throttled'] += 1
+            raise web.HTTPTooManyRequests(headers={'Retry-After': '0.1'})
+
+    def movie(movie_id):
+        r = random.Random(movie_id)
+        return {
+            'id': movie_id,
+            'title': f'Filme {movie_id}',
+            'overview': f'Sinopse do filme {movie_id}.',
+            'genres': [{'id': i, 'name': g} for i, g in enumerate(r.sample(GENRES, r.randint(1, 3)))],
+            'keywords': {'keywords': [{'id': i, 'name': k} for i, k in enumerate(r.sample(KEYWORDS, r.randint(0, 4)))]},
+            'popularity': round(r.uniform(0, 50), 3),
+            'vote_average': round(r.uniform(0, 10), 1),
+            'original_language': 'pt',
+            'poster_path': f'/poster_{movie_id}.jpg',
+        }
+
+    async def discover(request):
+        if not request.query.get('api_key'):
+            raise web.HTTPUnauthorized()
+        maybe_throttle()
+        requests_seen['discover'] += 1
+        page = int(request.query.get('page', 1))
+        start = (page - 1) * per_page + 1
+        results = [{'id': i} for i in range(start, start + per_page)] if page <= pages else []
+        return web.json_response({'page': page, 'results': results, 'total_pages': pages})
+
+    async def details(request):
+        maybe_throttle()
+        requests_seen['details'] += 1
+        movie_id = int(request.match_info['movie_id'])
+        if movie_id > pages * per_page:
+            raise web.HTTPNotFound()
+        return web.json_response(movie(movie_id))
+
+    async def stats(request):
+        return web.json_response(requests_seen)
+
+    app = web.Application()
+    app.router.add_get('/discover/movie', discover)
+    app.router.add_get('/movie/{movie_id}', details)
+    app.router.add_get('/_stats', stats)
+    return app
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Servidor TMDB falso para testar fetch_tmdb.py')
+    parser.add_argument('--port', type=int, default=PORT)
+    parser.add_argument('--pages', type=int, default=PAGES)
+    parser.add_argument('--per-page', type=int, default=PER_PAGE)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    web.run_app(make_app(args.pages, args.per_page, args.error_rate), host='127.0.0.1', port=args.port)
@@ -0,0 +1,191 @@
+import os
+import json
+import tempfile
+from hashlib import blake2b
+from contextlib import nullcontext
+
+# === CONFIGURAÇÕES ===
+# blake2b com digest de 64 bytes = 'blake2b512' do crypto do Node (backend/src/utils/artifact.js)
+HASH_ALGORITHM = 'blake2b'
+ROWS_PER_WRITE = 512
+TRAILER_BYTES = 1 << 20  # metadata fica no fim do arquivo e cabe folgado em 1 MB
+METADATA_KEY = b',"metadata":'
+
+VERIFY_FULL = 'full'
+VERIFY_LAZY = 'lazy'
+VERIFY_SKIP = 'skip'
+
+class IntegrityError(ValueError):
+    pass
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def _iter_json(value):
+    """Serializa listas (e matrizes NumPy) em blocos de linhas, sempre pelo encoder em C"""
+    if hasattr(value, 'tolist') and getattr(value, 'ndim', 0) >= 2 or isinstance(value, list):
+        yield '['
+        for start in range(0, len(value), ROWS_PER_WRITE):
+            rows = value[start:start + ROWS_PER_WRITE]
+            rows = rows.tolist() if hasattr(rows, 'tolist') else rows
+            chunk = ','.join(_dumps(row) for row in rows)
+            yield (',' + chunk) if start else chunk
+        yield ']'
+    else:
+        yield _dumps(value.tolist() if hasattr(value, 'tolist') else value)
+
+# === ESCRITA ===
+def _target_mode(path):
+    """Mesmo modo do arquivo substituído; sem ele, o padrão de open() (0666 - umask).
+
+    mkstemp cria o temporário com 0600 e os.replace preservaria isso, deixando
+    o artefato ilegível para um backend rodando com outro usuário.
+    """
+    try:
+        return os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_artifact(path, sections, metadata, timer=None):
+    """Grava {"<seção>": ..., ..., "metadata": {...}} de forma atômica.
+
+    Cada seção é hasheada enquanto é escrita; offsets, tamanhos e hashes vão
+    em metadata['integrity'], e metadata['checksum'] resume todas as seções.
+    O arquivo só aparece no caminho final (os.replace) depois do fsync, então
+    um artefato escrito pela metade nunca é carregado.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+
+    integrity = {}
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), _target_mode(path))
+            f.write(b'{')
+            offset = 1
+            with timer.stage('serialize') if timer else nullcontext():
+                for i, (name, value) in enumerate(sections.items()):
+                    prefix = (b',' if i else b'') + _dumps(name).encode('utf-8') + b':'
+                    f.write(prefix)
+                    offset += len(prefix)
+
+                    digest = blake2b()
+                    length = 0
+                    for chunk in _iter_json(value):
+                        data = chunk.encode('utf-8')
+                        digest.update(data)
+                        f.write(data)
+                        length += len(data)
+                    integrity[name] = {'offset': offset, 'length': length, 'hash': digest.hexdigest()}
+                    offset += length
+
+            summary = blake2b(digest_size=32)
+            for name in sections:
+                summary.update(bytes.fromhex(integrity[name]['hash']))
+
+            metadata = dict(metadata)
+            if timer:
+                metadata['timings'] = timer.report()
+            metadata['checksum'] = summary.hexdigest()
+            metadata['integrity'] = {'algorithm': HASH_ALGORITHM, 'sections': integrity}
+
+            f.write(METADATA_KEY + _dumps(metadata).encode('utf-8') + b'}')
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # Persiste a entrada do diretório (rename) em sistemas POSIX
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return metadata
+
+# === LEITURA ===
+def read_metadata(path):
+    """Lê só o metadata do fim do arquivo (None para artefatos sem seções)"""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        f.seek(max(0, size - TRAILER_BYTES))
+        tail = f.read()
+    pos = tail.rfind(METADATA_KEY)
+    if pos < 0:
+        return None
+    try:
+        metadata = json.loads(tail[pos + len(METADATA_KEY):].rstrip()[:-1])
+    except json.JSONDecodeError:
+        return None
+    return metadata if 'integrity' in metadata else None
+
+def artifact_checksum(path):
+    metadata = read_metadata(path)
+    return metadata.get('checksum') if metadata else None
+
+class Artifact:
+    """Acesso por seção a um artefato gravado por write_artifact.
+
+    verify='full' confere todas as seções na abertura, 'lazy' confere cada
+    seção no primeiro acesso e 'skip' não confere nada. Seções não acessadas
+    nem chegam a ser lidas do disco.
+    """
+
+    def __init__(self, path, verify=VERIFY_LAZY):
+        if verify not in (VERIFY_FULL, VERIFY_LAZY, VERIFY_SKIP):
+            raise ValueError(f"verify inválido: {verify}")
+        self.path = path
+        self.verify = verify
+        self._cache = {}
+        self.metadata = read_metadata(path)
+
+        if self.metadata is None:
+            # Artefato antigo (json.dump direto): sem hashes, carrega tudo
+            with open(path, encoding='utf-8') as f:
+                self._cache = json.load(f)
+            self.metadata = self._cache.pop('metadata', {})
+            self._sections = {}
+            return
+
+        self._sections = self.metadata['integrity']['sections']
+        if verify == VERIFY_FULL:
+            for name in self._sections:
+                self[name]
+
+    def keys(self):
+        return list(self._sections) or [k for k in self._cache]
+
+    def __contains__(self, name):
+        return name in self._sections or name in self._cache or name == 'metadata'
+
+    def __getitem__(self, name):
+        if name == 'metadata':
+            return self.metadata
+        if name in self._cache:
+            return self._cache[name]
+        if name not in self._sections:
+            raise KeyError(name)
+
+        info = self._sections[name]
+        with open(self.path, 'rb') as f:
+            f.seek(info['offset'])
+            data = f.read(info['length'])
+        if len(data) != info['length']:
+            raise IntegrityError(f"{self.path}: seção '{name}' truncada")
+        if self.verify != VERIFY_SKIP and blake2b(data).hexdigest() != info['hash']:
+            raise IntegrityError(f"{self.path}: hash da seção '{name}' não confere")
+
+        value = json.loads(data)
+        self._cache[name] = value
+        return value
+
+def read_artifact(path, verify=VERIFY_LAZY):
+    return Artifact(path, verify)
@@ -1,7 +1,8 @@
-import pandas as pd
-import json
-from    .feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfVectorizer
 import stopwordsiso as stopwords
+from catalog import load_catalog, join_list
+from instrumentation import StageTimer
+from artifact_io import write_artifact
 
 WEIGHTS = {
     'title': 1.0,
@@ -10,14 +11,12 @@ WEIGHTS = {
     'genres': 2.0
 }
 
-CSV_PATH = 'data/processed/movies.csv'
+OUTPUT_PATH = 'data/model/tfidf_vectors.json'
 
-df = pd.read_csv(CSV_PATH)
-for col in ['title', 'overview', 'keywords', 'genres']:
-    if col not in df.columns:
-        df[col] = ''
-    else:
-        df[col] = df[col].fillna('')
+timer = StageTimer()
+
+with timer.stage('load_csv'):
+    df = load_catalog(columns=['title', 'overview', 'keywords', 'genres'])
 
 def weighted_text(row):
     parts = []
@@ -31,25 +30,31 @@ def weighted_text(row):
         parts.append(row['genres'] + ' ')
     return ''.join(parts).lower()
 
-corpus = df.apply(weighted_text, axis=1).tolist()
+with timer.stage('preprocess'):
+    for col in ['keywords', 'genres']:
+        df[col] = df[col].map(join_list)
+    corpus = df.apply(weighted_text, axis=1).tolist()
 
 ptbr_stopwords = list(stopwords.stopwords("pt"))
 
-vectorizer = TfidfVectorizer(max_features=3000, stop_words=ptbr_stopwords)
-X = vectorizer.fit_transform(corpus)
+with timer.stage('vectorize'):
+    vectorizer = TfidfVectorizer(max_features=3000, stop_words=ptbr_stopwords)
+    X = vectorizer.fit_transform(corpus)
 
-vocab = vectorizer.get_feature_names_out()
-idf = vectorizer.idf_  # array de idf para cada termo
+    vocab = vectorizer.get_feature_names_out()
+    idf = vectorizer.idf_  # array de idf para cada termo
 
-tfidf_vectors = X.toarray()
+    tfidf_vectors = X.toarray()
 
 output = {
     'vocabArray': vocab.tolist(),
-    'idf': idf.tolist(),
-    'tfidfVectors': tfidf_vectors.tolist()
+    'idf': idf,
+    'tfidfVectors': tfidf_vectors
 }
 
-with open('data/model/tfidf_vectors.json', 'w', encoding='utf-8') as f:
-    json.dump(output, f, ensure_ascii=False, indent=2)
+# metadata entra por último, já com o tempo de serialização e os hashes por seção
+metadata = write_artifact(OUTPUT_PATH, output, {}, timer)
 
-print('Vetores TF-IDF com IDF salvos em data/model/tfidf_vectors.json')
+for entry in timer.stages:
+    print(f"{entry['stage']}: {entry['wall_s']}s (rss {entry['rss_mb']} MB)")
+print(f"Vetores TF-IDF com IDF salvos em {OUTPUT_PATH} (checksum {metadata['checksum']})")
@@ -0,0 +1,120 @@
+import argparse
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+# === CONFIGURAÇÕES ===
+ROOT_DIR = Path(__file__).resolve().parents[2]
+CSV_PATH = ROOT_DIR / 'data' / 'processed' / 'movies.csv'
+CATALOG_PATH = ROOT_DIR / 'data' / 'processed' / 'movies.parquet'
+
+TEXT_COLS = ['title', 'overview', 'poster', 'original_language']
+LIST_COLS = ['genres', 'keywords']
+NUMERIC_COLS = ['popularity', 'rating']
+
+logger = logging.getLogger(__name__)
+
+# === NORMALIZAÇÃO ===
+def split_list(value):
+    """Converte 'Drama, Comédia' em ['Drama', 'Comédia'] (ignora vazios e NaN)"""
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    if pd.isna(value):
+        return []
+    return [v.strip() for v in str(value).split(',') if v.strip()]
+
+def join_list(values, sep=', '):
+    """Inverso de split_list, para quem precisa do campo como texto"""
+    return sep.join(values) if values else ''
+
+def parse_decimal(series):
+    """Aceita tanto '7.5' quanto '7,5' (exportação do Excel em pt-BR)"""
+    cleaned = series.astype(str).str.strip().str.replace(',', '.', regex=False)
+    return pd.to_numeric(cleaned, errors='coerce').fillna(0.0).astype('float64')
+
+def normalize_catalog(df):
+    """Aplica, em um único lugar, todas as correções de tipo do CSV bruto"""
+    if 'id' not in df.columns:
+        raise ValueError("Coluna 'id' ausente no catálogo")
+
+    df = df.copy()
+    df['id'] = pd.to_numeric(df['id'], errors='coerce')
+    df = df.dropna(subset=['id'])
+    df['id'] = df['id'].astype('int64')
+    df = df.drop_duplicates(subset='id', keep='first').reset_index(drop=True)
+
+    for col in TEXT_COLS:
+        if col not in df.columns:
+            df[col] = ''
+        df[col] = df[col].fillna('').astype(str).str.strip()
+
+    for col in LIST_COLS:
+        if col not in df.columns:
+            df[col] = ''
+        df[col] = df[col].map(split_list)
+
+    for col in NUMERIC_COLS:
+        if col not in df.columns:
+            df[col] = 0.0
+        df[col] = parse_decimal(df[col])
+
+    return df[['id'] + TEXT_COLS + LIST_COLS + NUMERIC_COLS]
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    fields = [pa.field('id', pa.int64())]
+    fields += [pa.field(col, pa.string()) for col in TEXT_COLS]
+    fields += [pa.field(col, pa.list_(pa.string())) for col in LIST_COLS]
+    fields += [pa.field(col, pa.float64()) for col in NUMERIC_COLS]
+    return pa.schema(fields)
+
+# === INGESTÃO ===
+def build_catalog(csv_path=CSV_PATH, output_path=CATALOG_PATH):
+    """Lê o CSV uma única vez e grava o catálogo tipado em Parquet"""
+    logger.info(f"Lendo {csv_path}")
+    df = normalize_catalog(pd.read_csv(csv_path, dtype=str, keep_default_na=False))
+    write_catalog(df, output_path)
+    return df
+
+def write_catalog(df, output_path=CATALOG_PATH):
+    """Grava um DataFrame já normalizado (normalize_catalog) em Parquet"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, schema=_arrow_schema(), preserve_index=False)
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, output_path, compression='zstd')
+    logger.info(f"Catálogo com {len(df)} filmes salvo em {output_path}")
+
+# === LEITURA ===
+def load_catalog(columns=None, path=CATALOG_PATH):
+    """Carrega apenas as colunas pedidas; listas chegam como list[str]"""
+    path = Path(path)
+    if not path.exists():
+        logger.warning(f"{path} não encontrado, normalizando {CSV_PATH} em memória "
+                       f"(rode scripts/nlp/catalog.py para gerar o Parquet)")
+        df = normalize_catalog(pd.read_csv(CSV_PATH, dtype=str, keep_default_na=False))
+        return df[columns].copy() if columns else df
+
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(path, columns=columns)
+    list_cols = [col for col in LIST_COLS if col in table.column_names]
+    df = table.drop(list_cols).to_pandas()
+    # to_pylist evita arrays numpy por célula, que quebram `if genres:`
+    for col in list_cols:
+        df[col] = table.column(col).to_pylist()
+    return df[table.column_names]
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    parser = argparse.ArgumentParser(description='Gera o catálogo Parquet a partir do CSV processado')
+    parser.add_argument('--csv', default=str(CSV_PATH))
+    parser.add_argument('--output', default=str(CATALOG_PATH))
+    args = parser.parse_args()
+    build_catalog(args.csv, args.output)
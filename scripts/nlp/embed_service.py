@@ -1,10 +1,51 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response
+from werkzeug.serving import WSGIRequestHandler
+import os
 import unicodedata
 import re
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+import torch
 from sentence_transformers import SentenceTransformer
+from instrumentation import Registry, current_rss_bytes, LATENCY_BUCKETS, SIZE_BUCKETS, BATCH_BUCKETS
+from model_registry import DEFAULT_MODEL, get_spec
+
+try:
+    import msgpack
+except ImportError:  # msgpack é opcional; sem ele o serviço oferece só JSON e float32 bruto
+    msgpack = None
+
+CACHE_SIZE = 2048  # vetores mantidos em memória por modelo, chave = texto limpo
+# Modelos do registro carregados neste processo (ex.: EMBED_MODELS=minilm,e5-small);
+# o primeiro atende requisições que não informam "model"
+SERVED_MODELS = [m.strip() for m in os.environ.get('EMBED_MODELS', DEFAULT_MODEL).split(',') if m.strip()]
+EMBED_THREADS = int(os.environ.get('EMBED_THREADS', os.cpu_count() or 1))
+
+# Formatos de resposta negociados pelo header Accept (JSON continua sendo o padrão)
+MIME_JSON = 'application/json'
+MIME_FLOAT32 = 'application/octet-stream'
+MIME_MSGPACK = ('application/msgpack', 'application/x-msgpack')
 
 app = Flask(__name__)
-model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
+# Todos os modelos dividem o mesmo pool de threads do torch. Um encode por vez,
+# de qualquer modelo: cada um já usa o pool inteiro, e a espera no lock é a fila do serviço
+torch.set_num_threads(EMBED_THREADS)
+encode_lock = threading.Lock()
+
+# === Métricas (expostas em /metrics) ===
+metrics = Registry()
+REQUESTS = metrics.counter('embed_requests_total', 'Requisições por endpoint e status')
+CACHE_HITS = metrics.counter('embed_cache_hits_total', 'Textos servidos do cache de vetores')
+CACHE_MISSES = metrics.counter('embed_cache_misses_total', 'Textos que precisaram de encode')
+QUEUE_WAIT = metrics.histogram('embed_queue_wait_seconds', 'Espera pelo modelo antes do encode', LATENCY_BUCKETS)
+CLEAN_TIME = metrics.histogram('embed_clean_text_seconds', 'Tempo de clean_text por requisição', LATENCY_BUCKETS)
+ENCODE_TIME = metrics.histogram('embed_encode_seconds', 'Tempo de model.encode por chamada', LATENCY_BUCKETS)
+REQUEST_TIME = metrics.histogram('embed_request_seconds', 'Tempo total de /embed', LATENCY_BUCKETS)
+BATCH_SIZE = metrics.histogram('embed_batch_size', 'Textos por requisição', BATCH_BUCKETS)
+REQUEST_BYTES = metrics.histogram('embed_request_bytes', 'Tamanho do corpo recebido', SIZE_BUCKETS)
+RESPONSE_BYTES = metrics.histogram('embed_response_bytes', 'Tamanho do corpo enviado', SIZE_BUCKETS)
 
 # === Função de limpeza leve (sem remover acentos ou pontuação) ===
 def clean_text(text):
@@ -16,17 +57,141 @@ def clean_text(text):
     text = re.sub(r'[^\w\sáéíóúÁÉÍÓÚâêîôÂÊÎÔãõÃÕçÇ-]', '', text)  # Remove caracteres especiais
     return ' '.join(text.split())  # Normaliza espaços
 
+# === Modelos servidos (cada um com seu cache LRU de vetores) ===
+class EmbeddingModel:
+    def __init__(self, name):
+        self.spec = get_spec(name)
+        self.name = name
+        rss_before = current_rss_bytes()
+        load_start = time.perf_counter()
+        self.model = SentenceTransformer(self.spec['hf_name'])
+        self.load_s = round(time.perf_counter() - load_start, 3)
+        self.load_rss_mb = round((current_rss_bytes() - rss_before) / 2**20, 1)
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def encode(self, texts, use_cache=True):
+        """Encode com cache; só os textos ausentes vão ao modelo, em um único batch.
+
+        use_cache=False manda todos os textos ao modelo e não grava o resultado
+        (medições de latência, ex.: scripts/validator/compare_models.py).
+        """
+        vectors = [None] * len(texts)
+        missing = []
+        with self._cache_lock:
+            for i, text in enumerate(texts):
+                if use_cache and text in self._cache:
+                    self._cache.move_to_end(text)
+                    vectors[i] = self._cache[text]
+                else:
+                    missing.append(i)
+        CACHE_HITS.inc(len(texts) - len(missing), model=self.name)
+        CACHE_MISSES.inc(len(missing), model=self.name)
+
+        if missing:
+            prefix = self.spec['query_prefix']
+            wait_start = time.perf_counter()
+            with encode_lock:
+                QUEUE_WAIT.observe(time.perf_counter() - wait_start, model=self.name)
+                with ENCODE_TIME.time(model=self.name):
+                    encoded = self.model.encode([prefix + texts[i] for i in missing])
+            with self._cache_lock:
+                for i, vector in zip(missing, encoded):
+                    vectors[i] = vector
+                    if use_cache:
+                        self._cache[texts[i]] = vector
+                        if len(self._cache) > CACHE_SIZE:
+                            self._cache.popitem(last=False)
+        return vectors
+
+    def info(self):
+        return {
+            'name': self.name,
+            'hf_name': self.spec['hf_name'],
+            'dim': self.dim,
+            'load_s': self.load_s,
+            'load_rss_mb': self.load_rss_mb,
+            'cached_vectors': len(self._cache),
+        }
+
+models = {name: EmbeddingModel(name) for name in SERVED_MODELS}
+
+# === Formatos de resposta ===
+def negotiate_format():
+    offered = [MIME_JSON, MIME_FLOAT32] + (list(MIME_MSGPACK) if msgpack else [])
+    # Accept ausente (ex.: urllib) ou '*/*' escolhem JSON; None só para um Accept
+    # explícito sem nenhum formato suportado (406)
+    if not request.accept_mimetypes.provided:
+        return MIME_JSON
+    return request.accept_mimetypes.best_match(offered)
+
+def encode_response(vectors, is_batch, mimetype):
+    """float32 little-endian contíguo (linha a linha) para os formatos binários"""
+    if mimetype == MIME_JSON:
+        if is_batch:
+            return jsonify({'vectors': [v.tolist() for v in vectors]})
+        return jsonify({'vector': vectors[0].tolist()})
+
+    matrix = np.ascontiguousarray(np.stack(vectors), dtype='<f4')
+    count, dim = matrix.shape
+    if mimetype == MIME_FLOAT32:
+        response = Response(matrix.tobytes(), mimetype=MIME_FLOAT32)
+    else:
+        body = msgpack.packb({'count': count, 'dim': dim, 'dtype': 'float32', 'data': matrix.tobytes()})
+        response = Response(body, mimetype=mimetype)
+    response.headers['X-Embedding-Count'] = str(count)
+    response.headers['X-Embedding-Dim'] = str(dim)
+    response.headers['X-Embedding-Dtype'] = 'float32'
+    return response
+
 
 @app.route('/embed', methods=['POST'])
 def embed():
+    start = time.perf_counter()
+    REQUEST_BYTES.observe(request.content_length or 0)
     data = request.json
-    text = data.get('text', '')
-    if not text:
+
+    # Aceita {"text": "..."} ou, em lote, {"texts": ["...", ...]}, com "model" e "no_cache" opcionais
+    model = models.get(data.get('model') or SERVED_MODELS[0])
+    if model is None:
+        REQUESTS.inc(endpoint='embed', status='400')
+        return jsonify({'error': f"Modelo não carregado: {data.get('model')}",
+                        'models': SERVED_MODELS}), 400
+
+    batch = data.get('texts')
+    texts = batch if isinstance(batch, list) else [data.get('text', '')]
+    if not texts or not all(texts):
+        REQUESTS.inc(endpoint='embed', status='400')
         return jsonify({'error': 'Texto ausente'}), 400
 
-    cleaned_text = clean_text(text)
-    vector = model.encode(cleaned_text).tolist()
-    return jsonify({'vector': vector})
+    mimetype = negotiate_format()
+    if mimetype is None:
+        REQUESTS.inc(endpoint='embed', status='406')
+        return jsonify({'error': 'Formato não suportado no header Accept'}), 406
+
+    BATCH_SIZE.observe(len(texts))
+    with CLEAN_TIME.time():
+        cleaned = [clean_text(t) for t in texts]
+    vectors = model.encode(cleaned, use_cache=not data.get('no_cache'))
+
+    response = encode_response(vectors, isinstance(batch, list), mimetype)
+    response.headers['X-Embedding-Model'] = model.name
+
+    RESPONSE_BYTES.observe(response.calculate_content_length() or 0)
+    REQUEST_TIME.observe(time.perf_counter() - start, model=model.name)
+    REQUESTS.inc(endpoint='embed', status='200', model=model.name)
+    return response
+
+@app.route('/models', methods=['GET'])
+def list_models():
+    return jsonify({'default': SERVED_MODELS[0], 'models': [m.info() for m in models.values()]})
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
+    # HTTP/1.1 mantém a conexão aberta entre requisições (keep-alive)
+    WSGIRequestHandler.protocol_version = 'HTTP/1.1'
+    app.run(host='0.0.0.0', port=5000, threaded=True)
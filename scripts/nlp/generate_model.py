@@ -1,17 +1,18 @@
 import pandas as pd
 import numpy as np
-import json
 import logging
 import re
+import argparse
 import unicodedata
 from pathlib import Path
 from sentence_transformers import SentenceTransformer
-from hashlib import md5
+from catalog import load_catalog, join_list, LIST_COLS
+from instrumentation import StageTimer
+from artifact_io import write_artifact
+from model_registry import MODELS, DEFAULT_MODEL, get_spec, artifact_path
 
 # === CONFIGURAÇÕES ===
-CSV_FILE = './data/movies.csv'
-OUTPUT_FILE = './model.json'
-MODEL_NAME = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+# Modelo e caminho de saída vêm de model_registry.py (--model / --output)
 
 WEIGHTS = {
     'title': 1.0,
@@ -76,10 +77,10 @@ def combine_text_fields(row):
     )
 
 # === GERADOR DE EMBEDDINGS ===
-def generate_embeddings(texts, model):
+def generate_embeddings(texts, model, prefix=''):
     """Gera embeddings com verificações de qualidade"""
     logger.info("Gerando embeddings...")
-    embeddings = model.encode(texts, show_progress_bar=True)
+    embeddings = model.encode([prefix + t for t in texts], show_progress_bar=True)
     
     # Verificação de qualidade
     norms = np.linalg.norm(embeddings, axis=1)
@@ -111,70 +112,78 @@ def calculate_similarity_stats(embeddings):
     }
 
 # === UTILITÁRIOS ===
-def save_model_with_checksum(data, output_path):
-    """Salva o modelo com checksum para verificação"""
-    json_str = json.dumps(data, ensure_ascii=False, indent=2)
-    checksum = md5(json_str.encode('utf-8')).hexdigest()
+def save_model_with_checksum(data, output_path, timer=None):
+    """Salva o modelo de forma atômica, com hash por seção gravado em metadata.integrity"""
+    timer = timer or StageTimer(logger)
+    sections = {name: value for name, value in data.items() if name != 'metadata'}
+    metadata = write_artifact(output_path, sections, data['metadata'], timer)
+    data['metadata'] = metadata
     
-    data['metadata']['checksum'] = checksum
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    
-    logger.info(f"Modelo salvo com checksum: {checksum}")
+    logger.info(f"Modelo salvo com checksum: {metadata['checksum']}")
 
 # === FLUXO PRINCIPAL ===
-def generate_model():
+def generate_model(name=DEFAULT_MODEL, output_path=None):
     try:
-        logger.info("Iniciando geração do modelo...")
+        spec = get_spec(name)
+        output_path = output_path or artifact_path(name)
+        logger.info(f"Iniciando geração do modelo '{name}'...")
         
+        timer = StageTimer(logger)
+
         # 1. Carregar e validar dados
-        logger.info(f"Carregando dados de {CSV_FILE}")
-        df = pd.read_csv(CSV_FILE, low_memory=False)
-        validate_dataframe(df)
+        logger.info("Carregando catálogo...")
+        with timer.stage('load_csv'):
+            df = load_catalog(columns=REQUIRED_COLS)
+            validate_dataframe(df)
         
-        # Pré-processamento
-        df = df[REQUIRED_COLS].copy()
-        df.fillna('', inplace=True)
-        
-        # 2. Processamento de texto
+        # 2. Pré-processamento (o model.json mantém gêneros/keywords como texto)
         logger.info("Processando campos de texto...")
-        df['combined'] = df.apply(combine_text_fields, axis=1)
-        
-        # Fallback para overviews faltantes
-        if df['overview'].str.len().median() < 10:
-            df['overview'] = df.apply(
-                lambda x: x['overview'] if x['overview'].strip() else x['title'],
-                axis=1
-            )
+        with timer.stage('preprocess'):
+            for col in LIST_COLS:
+                df[col] = df[col].map(join_list)
+            df.fillna('', inplace=True)
+            df['combined'] = df.apply(combine_text_fields, axis=1)
+            
+            # Fallback para overviews faltantes
+            if df['overview'].str.len().median() < 10:
+                df['overview'] = df.apply(
+                    lambda x: x['overview'] if x['overview'].strip() else x['title'],
+                    axis=1
+                )
         
         # 3. Carregar modelo de embeddings
-        logger.info(f"Carregando modelo {MODEL_NAME}...")
-        model = SentenceTransformer(MODEL_NAME)
+        logger.info(f"Carregando modelo {spec['hf_name']}...")
+        with timer.stage('load_model'):
+            model = SentenceTransformer(spec['hf_name'])
         
         # 4. Gerar embeddings
-        embeddings = generate_embeddings(df['combined'].tolist(), model)
-        embeddings = normalize_embeddings(embeddings)
+        with timer.stage('encode'):
+            embeddings = generate_embeddings(df['combined'].tolist(), model, spec['document_prefix'])
+        with timer.stage('normalize'):
+            embeddings = normalize_embeddings(embeddings)
+        with timer.stage('stats'):
+            similarity_stats = calculate_similarity_stats(embeddings)
         
         # 5. Construir estrutura de saída
         logger.info("Montando modelo final...")
         model_data = {
             "movies": df[REQUIRED_COLS].to_dict(orient='records'),
-            "embeddings": embeddings.tolist(),
+            "embeddings": embeddings,
             "metadata": {
-                "model": MODEL_NAME,
+                "model": spec['hf_name'],
+                "model_name": name,
                 "generation_date": pd.Timestamp.now().isoformat(),
                 "stats": {
                     "num_movies": len(df),
                     "avg_text_length": int(df['combined'].str.len().mean()),
                     "embedding_dim": embeddings.shape[1],
-                    "similarity": calculate_similarity_stats(embeddings)
+                    "similarity": similarity_stats
                 }
             }
         }
         
-        # 6. Salvar modelo
-        save_model_with_checksum(model_data, OUTPUT_FILE)
+        # 6. Salvar modelo (o relatório de etapas vai em metadata.timings)
+        save_model_with_checksum(model_data, output_path, timer)
         logger.info("Modelo gerado com sucesso!")
         return True
         
@@ -183,5 +192,9 @@ def generate_model():
         return False
 
 if __name__ == '__main__':
-    success = generate_model()
+    parser = argparse.ArgumentParser(description='Gera o model.json de um modelo de embedding do registro')
+    parser.add_argument('--model', choices=list(MODELS), default=DEFAULT_MODEL)
+    parser.add_argument('--output', default=None, help='padrão: data/model/<modelo>/model.json (data/model/model.json para o modelo padrão)')
+    args = parser.parse_args()
+    success = generate_model(args.model, args.output)
     exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,108 @@
+import numpy as np
+
+from catalog import load_catalog, CATALOG_PATH
+
+# === CONFIGURAÇÕES ===
+MAX_GENRES = 32  # um bit por gênero em uint32 (o TMDB tem 19)
+MISSING_ID = -1
+
+# === POPCOUNT ===
+if hasattr(np, 'bitwise_count'):
+    def popcount(masks):
+        return np.bitwise_count(np.asarray(masks, dtype=np.uint32)).astype(np.int64)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+    def popcount(masks):
+        """Fallback para NumPy < 2.0: soma a contagem de bits de cada byte"""
+        masks = np.ascontiguousarray(masks, dtype=np.uint32)
+        as_bytes = masks.view(np.uint8).reshape(masks.shape + (4,))
+        return _BYTE_POPCOUNT[as_bytes].sum(axis=-1)
+
+# === ÍNDICE ===
+class GenreIndex:
+    """Vocabulário de gêneros e uma máscara uint32 por filme do catálogo"""
+
+    def __init__(self, ids, genres):
+        vocab = sorted({g.strip().lower() for movie_genres in genres for g in movie_genres if g.strip()})
+        if len(vocab) > MAX_GENRES:
+            raise ValueError(f"Vocabulário com {len(vocab)} gêneros excede o limite de {MAX_GENRES}")
+
+        self.vocab = vocab
+        self.bits = {genre: np.uint32(1 << i) for i, genre in enumerate(vocab)}
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.masks = np.array([self.encode(movie_genres) for movie_genres in genres], dtype=np.uint32)
+
+        # IDs ordenados para lookup vetorizado via searchsorted
+        self._order = np.argsort(self.ids, kind='stable')
+        self._sorted_ids = self.ids[self._order]
+
+    @classmethod
+    def from_catalog(cls, path=CATALOG_PATH):
+        df = load_catalog(columns=['id', 'genres'], path=path)
+        return cls(df['id'].to_numpy(), df['genres'].tolist())
+
+    def encode(self, genres):
+        """Lista de gêneros -> máscara (gêneros fora do vocabulário são ignorados)"""
+        mask = 0
+        for genre in genres:
+            mask |= int(self.bits.get(genre.strip().lower(), 0))
+        return mask
+
+    def decode(self, mask):
+        return [genre for genre, bit in self.bits.items() if int(mask) & int(bit)]
+
+    def rows_for(self, ids):
+        """IDs (int ou str, qualquer formato) -> linhas do catálogo; -1 se desconhecido"""
+        ids = to_id_array(ids)
+        if len(self._sorted_ids) == 0:
+            return np.full(ids.shape, -1, dtype=np.int64)
+        pos = np.searchsorted(self._sorted_ids, ids)
+        pos = np.minimum(pos, len(self._sorted_ids) - 1)
+        found = self._sorted_ids[pos] == ids
+        return np.where(found, self._order[pos], -1)
+
+    def masks_for(self, ids):
+        """Máscaras para uma matriz de IDs; IDs desconhecidos viram 0 (sem gênero)"""
+        rows = self.rows_for(ids)
+        return np.where(rows >= 0, self.masks[np.maximum(rows, 0)], 0).astype(np.uint32)
+
+    def filter(self, genres, require_all=False):
+        """Máscara booleana sobre o catálogo, aplicável aos scores antes do top-k"""
+        wanted = np.uint32(self.encode(genres))
+        if require_all:
+            return (self.masks & wanted) == wanted
+        return (self.masks & wanted) != 0
+
+def to_id_array(ids):
+    """Converte IDs vindos de CSV/JSON ('123', 123, '', None) para int64"""
+    arr = np.asarray(ids, dtype=object)
+    flat = [
+        int(v) if v is not None and str(v).strip().lstrip('-').isdigit() else MISSING_ID
+        for v in arr.ravel()
+    ]
+    return np.array(flat, dtype=np.int64).reshape(arr.shape)
+
+# === MÉTRICAS ===
+def genre_scores(input_masks, rec_masks):
+    """Similaridade binária e proporcional de gênero para uma matriz (entradas x k).
+
+    Recomendados sem gênero (máscara 0) são ignorados; entradas sem gênero ou
+    sem nenhum recomendado válido resultam em NaN.
+    """
+    input_masks = np.asarray(input_masks, dtype=np.uint32)
+    rec_masks = np.atleast_2d(np.asarray(rec_masks, dtype=np.uint32))
+
+    inter = rec_masks & input_masks[:, None]
+    valid = rec_masks != 0
+    n_valid = valid.sum(axis=1)
+    input_count = popcount(input_masks)
+
+    hits = ((inter != 0) & valid).sum(axis=1)
+    overlap = np.where(valid, popcount(inter), 0).sum(axis=1)
+
+    defined = (input_count > 0) & (n_valid > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        binary = np.where(defined, hits / n_valid, np.nan)
+        proportional = np.where(defined, overlap / (input_count * n_valid), np.nan)
+    return binary, proportional
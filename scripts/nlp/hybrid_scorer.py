@@ -0,0 +1,94 @@
+import re
+
+import numpy as np
+from scipy import sparse
+
+# === CONFIGURAÇÕES ===
+# Mesmos pesos de backend/src/recommender.js
+WEIGHT_MINILM = 0.7
+WEIGHT_TFIDF = 0.3
+
+# Mesmo tokenizer de backend/src/utils/tfidf.js: /\b\w+\b/g sem a flag u só reconhece ASCII
+TOKEN_RE = re.compile(r'\b\w+\b', re.ASCII)
+
+def l2_normalize(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+class HybridScorer:
+    """Implementação de referência (NumPy) do kernel de backend/src/utils/hybridScorer.js.
+
+    Embeddings ficam numa matriz contígua com linhas em norma 1 e o TF-IDF numa
+    CSR com linhas em norma 1, então cada score é só produto interno.
+    """
+
+    def __init__(self, embeddings, tfidf_vectors, vocab, idf,
+                 weight_minilm=WEIGHT_MINILM, weight_tfidf=WEIGHT_TFIDF):
+        self.embeddings = np.ascontiguousarray(l2_normalize(np.asarray(embeddings, dtype=np.float32)))
+        tfidf = sparse.csr_matrix(np.asarray(tfidf_vectors, dtype=np.float32))
+        row_norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+        inv = np.divide(1.0, row_norms, out=np.zeros_like(row_norms), where=row_norms > 0)
+        self.tfidf = sparse.diags(inv.astype(np.float32)) @ tfidf
+        if self.tfidf.shape[0] != self.embeddings.shape[0]:
+            raise ValueError(f"TF-IDF com {self.tfidf.shape[0]} documentos, modelo com "
+                             f"{self.embeddings.shape[0]} filmes")
+
+        self.term_index = {term: i for i, term in enumerate(vocab)}
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.weight_minilm = weight_minilm
+        self.weight_tfidf = weight_tfidf
+
+    @classmethod
+    def from_artifacts(cls, model, tfidf, **weights):
+        """model/tfidf: dicionários de model.json e tfidf_vectors.json"""
+        return cls(model['embeddings'], tfidf['tfidfVectors'], tfidf['vocabArray'], tfidf['idf'], **weights)
+
+    def vectorize_queries(self, texts):
+        """TF bruto * IDF, normalizado por linha (CSR queries x vocabulário)"""
+        rows, cols, vals = [], [], []
+        for row, text in enumerate(texts):
+            counts = {}
+            for token in TOKEN_RE.findall(text.lower()):
+                col = self.term_index.get(token)
+                if col is not None:
+                    counts[col] = counts.get(col, 0) + 1
+            for col, tf in counts.items():
+                rows.append(row)
+                cols.append(col)
+                vals.append(tf * self.idf[col])
+        q = sparse.csr_matrix((np.asarray(vals, dtype=np.float32), (rows, cols)),
+                              shape=(len(texts), len(self.idf)))
+        norms = np.sqrt(np.asarray(q.multiply(q).sum(axis=1)).ravel())
+        inv = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+        return sparse.diags(inv.astype(np.float32)) @ q
+
+    def dense_scores(self, query_vecs):
+        """Cosseno denso, consultas x catálogo"""
+        q = l2_normalize(np.atleast_2d(np.asarray(query_vecs, dtype=np.float32)))
+        return q @ self.embeddings.T
+
+    def tfidf_scores(self, texts):
+        """Cosseno TF-IDF, consultas x catálogo"""
+        return np.asarray((self.vectorize_queries(texts) @ self.tfidf.T).todense(), dtype=np.float32)
+
+    def scores(self, query_vecs, texts):
+        return (self.weight_minilm * self.dense_scores(query_vecs)
+                + self.weight_tfidf * self.tfidf_scores(texts))
+
+    def top_k(self, query_vecs, texts, k, mask=None):
+        """Índices e scores dos k melhores por consulta, do maior para o menor.
+
+        mask: booleano sobre o catálogo (ex.: GenreIndex.filter) aplicado antes do top-k.
+        """
+        fused = self.scores(query_vecs, texts)
+        if mask is not None:
+            fused = np.where(mask[None, :], fused, -np.inf)
+        return top_k(fused, k)
+
+def top_k(scores, k):
+    """argpartition + ordenação só dos k escolhidos"""
+    k = min(k, scores.shape[1])
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind='stable')
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(part_scores, order, axis=1)
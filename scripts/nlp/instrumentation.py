@@ -0,0 +1,147 @@
+import os
+import time
+import bisect
+import resource
+import threading
+from contextlib import contextmanager
+
+# === MEMÓRIA ===
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+def current_rss_bytes():
+    """RSS atual (Linux via /proc); em outros sistemas cai para o pico do processo"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+def peak_rss_bytes():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+# === TEMPO POR ETAPA (build) ===
+class StageTimer:
+    """Registra tempo de parede, CPU e RSS de cada etapa do build"""
+
+    def __init__(self, logger=None):
+        self.logger = logger
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        rss_before = current_rss_bytes()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            entry = {
+                'stage': name,
+                'wall_s': round(time.perf_counter() - wall_start, 4),
+                'cpu_s': round(time.process_time() - cpu_start, 4),
+                'rss_mb': round(current_rss_bytes() / 2**20, 1),
+                'rss_delta_mb': round((current_rss_bytes() - rss_before) / 2**20, 1),
+            }
+            self.stages.append(entry)
+            if self.logger:
+                self.logger.info(f"Etapa '{name}': {entry['wall_s']}s (cpu {entry['cpu_s']}s, "
+                                 f"rss {entry['rss_mb']} MB)")
+
+    def report(self):
+        return {
+            'stages': list(self.stages),
+            'total_wall_s': round(sum(s['wall_s'] for s in self.stages), 4),
+            'peak_rss_mb': round(peak_rss_bytes() / 2**20, 1),
+        }
+
+# === MÉTRICAS DO SERVIÇO (formato texto do Prometheus) ===
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in sorted(labels.items())) + '}'
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f'{self.name}{_format_labels(dict(key))} {value}')
+        return lines
+
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = sorted(buckets)
+        self._series = {}  # labels -> [contagens por bucket (último = +Inf), soma, total]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        i = bisect.bisect_left(self.buckets, value)
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (counts, total_sum, total_count) in self._series.items():
+                labels = dict(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": bound})} {cumulative}')
+                lines.append(f'{self.name}_bucket{_format_labels({**labels, "le": "+Inf"})} {total_count}')
+                lines.append(f'{self.name}_sum{_format_labels(labels)} {total_sum}')
+                lines.append(f'{self.name}_count{_format_labels(labels)} {total_count}')
+        return lines
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def counter(self, name, help_text):
+        metric = Counter(name, help_text)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help_text, buckets):
+        metric = Histogram(name, help_text, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
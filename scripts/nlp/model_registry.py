@@ -0,0 +1,49 @@
+from pathlib import Path
+
+# === CONFIGURAÇÕES ===
+ROOT_DIR = Path(__file__).resolve().parents[2]
+MODEL_DIR = ROOT_DIR / 'data' / 'model'
+DEFAULT_MODEL = 'minilm'
+
+# nome curto -> modelo do Hugging Face. Os prefixos são exigidos por famílias
+# como a E5, que distinguem consultas de documentos no próprio texto.
+MODELS = {
+    'minilm': {
+        'hf_name': 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2',
+        'description': 'MiniLM L12 multilíngue, 384 dimensões (modelo atual)',
+    },
+    'mpnet': {
+        'hf_name': 'sentence-transformers/paraphrase-multilingual-mpnet-base-v2',
+        'description': 'MPNet base multilíngue, 768 dimensões (maior e mais lento)',
+    },
+    'distiluse': {
+        'hf_name': 'sentence-transformers/distiluse-base-multilingual-cased-v2',
+        'description': 'DistilUSE multilíngue destilado, 512 dimensões',
+    },
+    'e5-small': {
+        'hf_name': 'intfloat/multilingual-e5-small',
+        'description': 'E5 small multilíngue, 384 dimensões',
+        'query_prefix': 'query: ',
+        'document_prefix': 'passage: ',
+    },
+}
+
+def get_spec(name):
+    """Especificação do modelo, com prefixos vazios quando o modelo não usa"""
+    if name not in MODELS:
+        raise ValueError(f"Modelo desconhecido: {name} (disponíveis: {', '.join(MODELS)})")
+    return {'name': name, 'query_prefix': '', 'document_prefix': '', **MODELS[name]}
+
+def artifact_path(name):
+    """Cada modelo tem o seu model.json: data/model/<nome>/model.json.
+
+    O modelo padrão fica em data/model/model.json, onde o backend e o
+    sweep_hybrid.py o procuram sem configuração.
+    """
+    get_spec(name)
+    if name == DEFAULT_MODEL:
+        return MODEL_DIR / 'model.json'
+    return MODEL_DIR / name / 'model.json'
+
+def available_artifacts():
+    return {name: artifact_path(name) for name in MODELS if artifact_path(name).exists()}
@@ -0,0 +1,151 @@
+import os
+import sys
+import json
+import time
+import argparse
+import urllib.request
+
+import numpy as np
+import pandas as pd
+
+from sweep_hybrid import load_inputs, embed_queries, CSV_INPUT, EMBEDDING_API_URL, USER_INPUT_COL, ORIGINAL_ID_COL
+from ranking_metrics import DEFAULT_KS, N_BOOTSTRAP, evaluate, bootstrap_ci, paired_bootstrap
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nlp'))
+from artifact_io import read_artifact
+from hybrid_scorer import HybridScorer, top_k
+from model_registry import MODELS, DEFAULT_MODEL, artifact_path
+
+# === CONFIG ===
+TFIDF_FILE = '../../data/model/tfidf_vectors.json'
+OUTPUT_COMPARISON = './model_comparison.csv'
+LATENCY_SAMPLE = 200
+MODES = ('dense', 'hybrid')
+
+# === Embedding service ===
+def service_models(embed_url):
+    """Models loaded by embed_service.py, with their load time and RSS growth"""
+    models_url = embed_url.rsplit('/', 1)[0] + '/models'
+    with urllib.request.urlopen(models_url, timeout=30) as resp:
+        return {m['name']: m for m in json.load(resp)['models']}
+
+def single_query_latency(queries, embed_url, model):
+    """One request per text, as the backend does; returns per-request seconds.
+
+    The service's vector cache is bypassed so every request reaches the model.
+    """
+    latencies = []
+    for query in queries:
+        body = json.dumps({'text': query, 'model': model, 'no_cache': True}).encode('utf-8')
+        req = urllib.request.Request(embed_url, data=body, headers={
+            'Content-Type': 'application/json',
+            'Accept': 'application/octet-stream',
+        })
+        start = time.perf_counter()
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+        latencies.append(time.perf_counter() - start)
+    return np.asarray(latencies)
+
+# === Quality ===
+def ranked_ids(scorer, movie_ids, query_vecs, queries, mode, k):
+    scores = scorer.dense_scores(query_vecs) if mode == 'dense' else scorer.scores(query_vecs, queries)
+    idx, _ = top_k(scores, k)
+    return movie_ids[idx]
+
+def compare_models(names, args):
+    df_input = load_inputs(args.inputs)
+    queries = df_input[USER_INPUT_COL].tolist()
+    targets = df_input[ORIGINAL_ID_COL].to_numpy()
+    tfidf = read_artifact(args.tfidf)
+    loaded = service_models(args.embed_url)
+    k_max = max(args.k)
+
+    rows, per_input = [], {}
+    for name in names:
+        if name not in loaded:
+            print(f"Skipping {name}: not loaded by the embedding service (set EMBED_MODELS)")
+            continue
+        path = artifact_path(name)
+        if not path.exists():
+            print(f"Skipping {name}: {path} not found (run generate_model.py --model {name})")
+            continue
+
+        model = read_artifact(path)
+        built_with = model.metadata.get('model_name', DEFAULT_MODEL)
+        if built_with != name:
+            print(f"Skipping {name}: {path} was built with {built_with}")
+            continue
+
+        print(f"[{name}] latency on {min(args.latency_sample, len(queries))} single queries...")
+        latencies = single_query_latency(queries[:args.latency_sample], args.embed_url, name)
+
+        print(f"[{name}] embedding {len(queries)} inputs in batches...")
+        start = time.perf_counter()
+        query_vecs = embed_queries(queries, args.embed_url, model=name, no_cache=True)
+        batch_s = time.perf_counter() - start
+
+        scorer = HybridScorer.from_artifacts(model, tfidf)
+        movie_ids = np.asarray([str(m['id']) for m in model['movies']])
+
+        for mode in MODES:
+            retrieved = ranked_ids(scorer, movie_ids, query_vecs, queries, mode, k_max)
+            metrics = evaluate(retrieved, targets, args.k)
+            per_input[(name, mode)] = metrics
+            row = {
+                'model': name,
+                'mode': mode,
+                'dim': loaded[name]['dim'],
+                'latency_p50_ms': np.percentile(latencies, 50) * 1000,
+                'latency_p95_ms': np.percentile(latencies, 95) * 1000,
+                'batch_texts_per_s': len(queries) / batch_s,
+                'model_rss_mb': loaded[name]['load_rss_mb'],
+                'embeddings_mb': scorer.embeddings.nbytes / 2**20,
+                'artifact_mb': path.stat().st_size / 2**20,
+            }
+            for k in args.k:
+                # Single relevant movie per input, so precision@k follows the sweep's hit@k convention
+                point, low, high = bootstrap_ci(metrics[f'hit@{k}'][:, None], n_boot=args.n_boot, seed=args.seed)
+                row[f'precision@{k}'] = point[0]
+                row[f'precision@{k}_low'] = low[0]
+                row[f'precision@{k}_high'] = high[0]
+                row[f'mrr@{k}'] = metrics[f'mrr@{k}'].mean()
+                row[f'ndcg@{k}'] = metrics[f'ndcg@{k}'].mean()
+            rows.append(row)
+
+    if not rows:
+        return pd.DataFrame()
+
+    # Paired test of every model against the first one evaluated, mode by mode
+    summary = pd.DataFrame(rows)
+    baseline = summary['model'].iloc[0]
+    metric = f'ndcg@{k_max}'
+    for i, row in summary.iterrows():
+        a = per_input[(row['model'], row['mode'])][metric][:, None]
+        b = per_input[(baseline, row['mode'])][metric][:, None]
+        diff, low, high, p_value = paired_bootstrap(a, b, n_boot=args.n_boot, seed=args.seed)
+        summary.loc[i, f'{metric}_diff_vs_{baseline}'] = diff[0]
+        summary.loc[i, 'p_value'] = p_value[0]
+    return summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare embedding models side by side: latency, memory and precision@k')
+    parser.add_argument('--models', nargs='+', default=list(MODELS), help='registry names; the first is the baseline')
+    parser.add_argument('--inputs', default=CSV_INPUT)
+    parser.add_argument('--tfidf', default=TFIDF_FILE)
+    parser.add_argument('--embed-url', default=EMBEDDING_API_URL)
+    parser.add_argument('--k', type=int, nargs='+', default=list(DEFAULT_KS))
+    parser.add_argument('--latency-sample', type=int, default=LATENCY_SAMPLE)
+    parser.add_argument('--n-boot', type=int, default=N_BOOTSTRAP)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=OUTPUT_COMPARISON)
+    args = parser.parse_args()
+
+    summary = compare_models(args.models, args)
+    if summary.empty:
+        print("No model could be evaluated.")
+        raise SystemExit(1)
+
+    summary.to_csv(args.output, index=False, float_format='%.6f')
+    print(summary.to_string(index=False, float_format=lambda v: f'{v:.4f}'))
+    print(f"\nComparison saved to {args.output}")
@@ -0,0 +1,84 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ranking_metrics import DEFAULT_KS, N_BOOTSTRAP, evaluate, pad_ids, bootstrap_ci, paired_bootstrap
+
+# === CONFIG ===
+RESULTS_A = '../../data/results/hybrid_evaluation_results.csv'
+RESULTS_B = '../../data/results/miniLM_evaluation_results.csv'
+OUTPUT_COMPARISON = './comparison_summary.csv'
+KEY_COLS = ['original_id', 'user_input']
+
+# === Loading ===
+def split_ids(value):
+    """top_k_ids is ',' separated in the hybrid export and '|' in the MiniLM one"""
+    if pd.isna(value):
+        return []
+    return [i.strip() for i in str(value).replace('|', ',').split(',') if i.strip()]
+
+def load_results(path):
+    df = pd.read_csv(path, encoding='utf-8-sig', dtype={'original_id': str},
+                     usecols=KEY_COLS + ['top_k_ids'])
+    df['original_id'] = df['original_id'].str.strip()
+    return df.drop_duplicates(subset=KEY_COLS)
+
+def align(df_a, df_b):
+    """Keep only inputs evaluated by both systems, in the same order"""
+    merged = df_a.merge(df_b, on=KEY_COLS, suffixes=('_a', '_b'))
+    targets = merged['original_id'].to_numpy()
+    ids_a = merged['top_k_ids_a'].map(split_ids).tolist()
+    ids_b = merged['top_k_ids_b'].map(split_ids).tolist()
+    return targets, ids_a, ids_b
+
+# === Comparison ===
+def compare(targets, ids_a, ids_b, ks=DEFAULT_KS, n_boot=N_BOOTSTRAP, seed=0):
+    k_max = max(ks)
+    metrics_a = evaluate(pad_ids(ids_a, k_max), targets, ks)
+    metrics_b = evaluate(pad_ids(ids_b, k_max), targets, ks)
+    names = list(metrics_a)
+
+    values_a = np.column_stack([metrics_a[name] for name in names])
+    values_b = np.column_stack([metrics_b[name] for name in names])
+
+    mean_a, low_a, high_a = bootstrap_ci(values_a, n_boot=n_boot, seed=seed)
+    mean_b, low_b, high_b = bootstrap_ci(values_b, n_boot=n_boot, seed=seed)
+    diff, low_d, high_d, p_value = paired_bootstrap(values_a, values_b, n_boot=n_boot, seed=seed)
+
+    return pd.DataFrame({
+        'metric': names,
+        'system_a': mean_a, 'system_a_low': low_a, 'system_a_high': high_a,
+        'system_b': mean_b, 'system_b_low': low_b, 'system_b_high': high_b,
+        'diff': diff, 'diff_low': low_d, 'diff_high': high_d,
+        'p_value': p_value,
+    })
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare two evaluation result CSVs with bootstrap CIs')
+    parser.add_argument('--a', default=RESULTS_A, help='results CSV of system A (default: hybrid)')
+    parser.add_argument('--b', default=RESULTS_B, help='results CSV of system B (default: MiniLM)')
+    parser.add_argument('--k', type=int, nargs='+', default=list(DEFAULT_KS))
+    parser.add_argument('--n-boot', type=int, default=N_BOOTSTRAP)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=OUTPUT_COMPARISON)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    targets, ids_a, ids_b = align(load_results(args.a), load_results(args.b))
+    if len(targets) == 0:
+        print("No inputs in common between the two result files.")
+        raise SystemExit(1)
+
+    summary = compare(targets, ids_a, ids_b, ks=args.k, n_boot=args.n_boot, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    summary.to_csv(args.output, index=False, float_format='%.6f')
+    print(f"A: {args.a}\nB: {args.b}\nInputs in common: {len(targets)}\n")
+    for row in summary.itertuples():
+        marker = '*' if row.p_value < 0.05 else ' '
+        print(f"{row.metric:<8} A={row.system_a:.4f} [{row.system_a_low:.4f}, {row.system_a_high:.4f}]  "
+              f"B={row.system_b:.4f} [{row.system_b_low:.4f}, {row.system_b_high:.4f}]  "
+              f"A-B={row.diff:+.4f} [{row.diff_low:+.4f}, {row.diff_high:+.4f}] p={row.p_value:.4f}{marker}")
+    print(f"\nComparison saved to {args.output} ({elapsed:.2f}s)")
@@ -1,25 +1,21 @@
 import os
+import sys
 import subprocess
 import json
 import pandas as pd
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nlp'))
+from genre_index import GenreIndex, genre_scores
 
 # === CONFIGURAÇÕES ===
 CSV_INPUT = '../../data/results/inputs.csv'        # arquivo com input_user e id_original (troque title por id)
-GENRES_FILE = '../../data/processed/movies.csv'      # arquivo auxiliar com id, title e genres
 COLUNA_INPUT = 'input_user'
 COLUNA_ID_ORIGINAL = 'id'  # coluna com ID do filme original no CSV de input
 NOME_FILME = 'title'
 RECOMMENDER = './run_recommender.js'
 TOP_K = 5
 
-def carregar_generos_dos_filmes():
-    df = pd.read_csv(GENRES_FILE)
-    # Garantir tipos string e limpeza básica
-    df['id'] = df['id'].astype(str).str.strip()
-    df['genres'] = df['genres'].astype(str).apply(lambda x: [g.strip().lower() for g in x.split(',')] if x.strip() else [])
-    # Criar dicionário id -> lista de gêneros (não inclui gêneros vazios)
-    return dict((film_id, genres) for film_id, genres in zip(df['id'], df['genres']) if genres)
-
 def buscar_similares_com_node(input_usuario):
     try:
         result = subprocess.run(
@@ -42,57 +38,9 @@ def buscar_similares_com_node(input_usuario):
         print("Saída recebida:", output)
         return []
 
-def limpar_generos(valor):
-    if isinstance(valor, list):
-        # Remove strings vazias e formata
-        return [g.strip().lower() for g in valor if g.strip()]
-    elif isinstance(valor, str):
-        # Garante que não é vazio antes de dividir
-        return [g.strip().lower() for g in valor.split(',') if g.strip()]
-    return []
-
-def avaliar_binaria_por_generos(generos_entrada, recomendacoes):
-    """Métrica 1: 1 se há pelo menos um gênero em comum, 0 caso contrário (por filme). Ignora recomendados sem gênero."""
-    generos_entrada_set = set(generos_entrada)
-    if not generos_entrada_set:
-        return 0.0
-
-    acertos = 0
-    count_validos = 0
-    for filme in recomendacoes:
-        generos_recomendado = set(limpar_generos(filme.get('genres', [])))
-        if not generos_recomendado:
-            continue  # ignora filmes sem gênero
-        count_validos += 1
-        if generos_entrada_set & generos_recomendado:
-            acertos += 1
-
-    if count_validos == 0:
-        return 0.0
-    return acertos / count_validos
-
-def avaliar_proporcional_por_generos(generos_entrada, recomendacoes):
-    """Métrica 2: proporção de gêneros do original presentes em cada recomendado (média). Ignora recomendados sem gênero."""
-    generos_entrada_set = set(generos_entrada)
-    if not generos_entrada_set:
-        return 0.0
-
-    proporcoes = []
-    for filme in recomendacoes:
-        generos_recomendado = set(limpar_generos(filme.get('genres', [])))
-        if not generos_recomendado:
-            continue
-        intersecao = generos_entrada_set.intersection(generos_recomendado)
-        proporcao = len(intersecao) / len(generos_entrada_set)
-        proporcoes.append(proporcao)
-
-    if not proporcoes:
-        return 0.0
-    return sum(proporcoes) / len(proporcoes)
-
 def processar_todos_os_inputs():
     df_input = pd.read_csv(CSV_INPUT, sep=",", quotechar='"', encoding="utf-8")
-    mapa_generos = carregar_generos_dos_filmes()
+    indice_generos = GenreIndex.from_catalog()
 
     # Validar colunas
     if COLUNA_INPUT not in df_input.columns or COLUNA_ID_ORIGINAL not in df_input.columns:
@@ -122,7 +70,8 @@ def processar_todos_os_inputs():
             print("Nenhum resultado encontrado.\n")
             continue
 
-        generos_original = mapa_generos.get(id_original, [])
+        mascara_original = indice_generos.masks_for([id_original])
+        generos_original = indice_generos.decode(mascara_original[0])
         if generos_original:
             generos_str = ', '.join(generos_original)
             print(f"Gêneros do filme original (arquivo auxiliar): {generos_str}\n")
@@ -147,10 +96,13 @@ def processar_todos_os_inputs():
             print("Resultado: ERRO! Filme original não está entre os top recomendados.\n")
 
         if generos_original:
-            score_binaria = avaliar_binaria_por_generos(generos_original, resultados[:TOP_K])
-            soma_binaria += score_binaria
+            # Máscaras dos recomendados (filmes sem gênero ficam com 0 e são ignorados)
+            mascaras_recomendados = indice_generos.masks_for([ids_recomendados])
+            binaria, proporcional = genre_scores(mascara_original, mascaras_recomendados)
+            score_binaria = 0.0 if np.isnan(binaria[0]) else float(binaria[0])
+            score_proporcional = 0.0 if np.isnan(proporcional[0]) else float(proporcional[0])
 
-            score_proporcional = avaliar_proporcional_por_generos(generos_original, resultados[:TOP_K])
+            soma_binaria += score_binaria
             soma_proporcional += score_proporcional
             total_genero += 1
 
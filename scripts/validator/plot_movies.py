@@ -1,17 +1,17 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 import matplotlib.ticker as ticker
 
-sns.set_theme(style="whitegrid")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nlp'))
+from catalog import load_catalog
 
-# Carregar CSV
-df = pd.read_csv("../../data/processed/movies.csv")
+sns.set_theme(style="whitegrid")
 
-# Corrigir vírgulas para ponto
-df['popularity'] = df['popularity'].astype(str).str.replace(',', '.').astype(float)
-df['rating'] = df['rating'].astype(str).str.replace(',', '.').astype(float)
+# Carregar catálogo (popularity/rating já numéricos, gêneros/keywords já em listas)
+df = load_catalog(columns=['title', 'genres', 'keywords', 'popularity', 'rating'])
 df['title'] = df['title'].str.replace(r'\$', 'S', regex=True)
 
 
@@ -66,7 +66,7 @@ plt.tight_layout()
 #plt.show()
 
 # ===== 3. Gêneros =====
-df_genres = df['genres'].dropna().str.split(',').explode().str.strip()
+df_genres = df['genres'].explode().dropna()
 genre_counts = df_genres.value_counts()
 genre_percent = (genre_counts / len(df) * 100).round(1)
 
@@ -84,11 +84,9 @@ plt.tight_layout()
 
 df_keywords = (
     df['keywords']
+    .explode()
     .dropna()
     .str.lower()               # transforma em minúsculas
-    .str.split(',')
-    .explode()
-    .str.strip()               # remove espaços antes/depois
 )
 keywords_counts = df_keywords.value_counts()
 
@@ -0,0 +1,99 @@
+import numpy as np
+
+# === CONFIG ===
+DEFAULT_KS = (1, 3, 5)
+N_BOOTSTRAP = 2000
+ALPHA = 0.05
+BOOTSTRAP_CHUNK = 500  # resamples per matrix product, keeps memory bounded
+
+# === Ranks ===
+def target_ranks(retrieved, targets):
+    """1-based rank of each target in its row of retrieved ids (0 when absent).
+
+    retrieved: (inputs x K) ids, padded with '' (or any non-id) for short lists
+    targets:   (inputs,) ids
+    """
+    retrieved = np.asarray(retrieved).astype(str)
+    targets = np.asarray(targets).astype(str)
+    if retrieved.ndim != 2 or retrieved.shape[0] != targets.shape[0]:
+        raise ValueError(f"Expected (inputs x K) ids for {targets.shape[0]} targets, got {retrieved.shape}")
+
+    match = retrieved == targets[:, None]
+    return np.where(match.any(axis=1), match.argmax(axis=1) + 1, 0)
+
+def pad_ids(id_lists, k):
+    """Ragged lists of ids -> (inputs x k) string array"""
+    return np.array(
+        [[str(i).strip() for i in ids[:k]] + [''] * (k - len(ids[:k])) for ids in id_lists],
+        dtype=object
+    ).astype(str).reshape(len(id_lists), k)
+
+# === Metrics (one value per input) ===
+def hit_at_k(ranks, k):
+    return ((ranks > 0) & (ranks <= k)).astype(np.float64)
+
+def mrr_at_k(ranks, k):
+    hit = (ranks > 0) & (ranks <= k)
+    return np.where(hit, 1.0 / np.maximum(ranks, 1), 0.0)
+
+def ndcg_at_k(ranks, k):
+    """Single relevant item, so IDCG = 1"""
+    hit = (ranks > 0) & (ranks <= k)
+    return np.where(hit, 1.0 / np.log2(np.maximum(ranks, 1) + 1), 0.0)
+
+def evaluate(retrieved, targets, ks=DEFAULT_KS):
+    """Per-input metric arrays for every K, e.g. {'hit@5': array, 'mrr@5': array, ...}"""
+    ranks = target_ranks(retrieved, targets)
+    metrics = {}
+    for k in ks:
+        metrics[f'hit@{k}'] = hit_at_k(ranks, k)
+        metrics[f'mrr@{k}'] = mrr_at_k(ranks, k)
+        metrics[f'ndcg@{k}'] = ndcg_at_k(ranks, k)
+    return metrics
+
+# === Bootstrap ===
+def _bootstrap_means(values, n_boot, seed):
+    """Means of n_boot resamples of the rows of values (inputs x metrics).
+
+    Rank metrics take only a few distinct values (K+1 per metric), so equal
+    rows are collapsed first and each resample is a row of multinomial counts
+    over the distinct rows, weighted by how often each occurs. This has the
+    same distribution as resampling the inputs and is one small matrix
+    product per chunk.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    n = values.shape[0]
+    if n == 0:
+        raise ValueError("Cannot bootstrap an empty sample")
+
+    distinct, freq = np.unique(values, axis=0, return_counts=True)
+    rng = np.random.default_rng(seed)
+    pvals = freq / n
+    means = np.empty((n_boot, values.shape[1]))
+    for start in range(0, n_boot, BOOTSTRAP_CHUNK):
+        size = min(BOOTSTRAP_CHUNK, n_boot - start)
+        counts = rng.multinomial(n, pvals, size=size)
+        means[start:start + size] = counts @ distinct / n
+    return means
+
+def bootstrap_ci(values, n_boot=N_BOOTSTRAP, alpha=ALPHA, seed=0):
+    """Percentile confidence interval of the mean for each column: (mean, low, high)"""
+    values = np.asarray(values, dtype=np.float64)
+    means = _bootstrap_means(values, n_boot, seed)
+    low, high = np.quantile(means, [alpha / 2, 1 - alpha / 2], axis=0)
+    point = values.mean(axis=0) if values.ndim > 1 else np.array([values.mean()])
+    return point, low, high
+
+def paired_bootstrap(a, b, n_boot=N_BOOTSTRAP, alpha=ALPHA, seed=0):
+    """Paired test of mean(a - b) for aligned per-input scores.
+
+    Returns (diff, low, high, p_value); p_value is two-sided.
+    """
+    diff = np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)
+    means = _bootstrap_means(diff, n_boot, seed)
+    low, high = np.quantile(means, [alpha / 2, 1 - alpha / 2], axis=0)
+    p_value = np.minimum(1.0, 2 * np.minimum((means <= 0).mean(axis=0), (means >= 0).mean(axis=0)))
+    point = diff.mean(axis=0) if diff.ndim > 1 else np.array([diff.mean()])
+    return point, low, high, p_value
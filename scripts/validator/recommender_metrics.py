@@ -1,13 +1,18 @@
 import os
+import sys
 import subprocess
 import json
 import pandas as pd
-import math
+import numpy as np
 import csv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nlp'))
+from catalog import load_catalog
+from genre_index import GenreIndex, genre_scores
+from ranking_metrics import evaluate, pad_ids
+
 # === CONFIG ===
 CSV_INPUT = '../../data/results/inputs.csv'
-GENRES_FILE = '../../data/processed/movies.csv'
 USER_INPUT_COL = 'input_user'
 ORIGINAL_ID_COL = 'id'
 TITLE_COL = 'title'
@@ -16,16 +21,10 @@ TOP_K = 5
 OUTPUT_RESULTS = './results.csv'      # CSV final com métricas e top k
 OUTPUT_SUMMARY = './metrics_summary.json'
 
-# === Load movie genres and titles ===
-def load_movie_genres():
-    df = pd.read_csv(GENRES_FILE)
-    df['id'] = df['id'].astype(str).str.strip()
-    df['genres'] = df['genres'].astype(str).apply(
-        lambda x: [g.strip().lower() for g in x.split(',')] if x.strip() else []
-    )
-    genre_map = {film_id: genres for film_id, genres in zip(df['id'], df['genres']) if genres}
-    title_map = {film_id: title for film_id, title in zip(df['id'], df['title'])}
-    return genre_map, title_map
+# === Load movie titles ===
+def load_movie_titles():
+    df = load_catalog(columns=['id', 'title'])
+    return dict(zip(df['id'].astype(str), df['title']))
 
 # === Call Node.js recommender ===
 def get_recommendations(user_input):
@@ -41,158 +40,85 @@ def get_recommendations(user_input):
     except Exception:
         return []
 
-# === Genre helpers ===
-def clean_genres(value):
-    if isinstance(value, list):
-        return [g.strip().lower() for g in value if g.strip()]
-    elif isinstance(value, str):
-        return [g.strip().lower() for g in value.split(',') if g.strip()]
-    return []
-
-# === Metrics ===
-def genre_binary_score(input_genres, recommendations):
-    input_set = set(input_genres)
-    if not input_set:
-        return None
-    hits, valid = 0, 0
-    for movie in recommendations:
-        rec_genres = set(clean_genres(movie.get('genres', [])))
-        if not rec_genres:
-            continue
-        valid += 1
-        if input_set & rec_genres:
-            hits += 1
-    return hits / valid if valid else None
-
-def genre_proportional_score(input_genres, recommendations):
-    input_set = set(input_genres)
-    if not input_set:
-        return None
-    proportions = []
-    for movie in recommendations:
-        rec_genres = set(clean_genres(movie.get('genres', [])))
-        if not rec_genres:
-            continue
-        proportions.append(len(input_set & rec_genres) / len(input_set))
-    return sum(proportions) / len(proportions) if proportions else None
-
-def precision_at_k(recommendations, original_id):
-    ids = [str(m.get('id', '')).strip() for m in recommendations[:TOP_K]]
-    return 1.0 if original_id in ids else 0.0
-
-def recall_at_k(recommendations, original_id):
-    ids = [str(m.get('id', '')).strip() for m in recommendations[:TOP_K]]
-    return 1.0 if original_id in ids else 0.0
-
-def mrr_score(recommendations, original_id):
-    ids = [str(m.get('id', '')).strip() for m in recommendations]
-    for rank, mid in enumerate(ids, start=1):
-        if mid == original_id:
-            return 1.0 / rank
-    return 0.0
-
-def ndcg_score(recommendations, original_id):
-    ids = [str(m.get('id', '')).strip() for m in recommendations]
-    for rank, mid in enumerate(ids, start=1):
-        if mid == original_id:
-            return 1 / math.log2(rank + 1)
-    return 0.0
-
 # === Main evaluation ===
 def process_all_inputs():
     df_input = pd.read_csv(CSV_INPUT, sep=",", quotechar='"', encoding="utf-8")
-    genre_map, title_map = load_movie_genres()
-
-    total = 0
-    precision_sum = 0.0
-    recall_sum = 0.0
-    mrr_sum = 0.0
-    ndcg_sum = 0.0
-    binary_sum = 0.0
-    prop_sum = 0.0
-    genre_count = 0
-    total_results_without_genres = 0
+    title_map = load_movie_titles()
+    genre_index = GenreIndex.from_catalog()
 
-    with open(OUTPUT_RESULTS, 'w', newline='', encoding='utf-8-sig') as csvfile:
-        writer = csv.writer(csvfile)
-        writer.writerow([
-            'original_id', 'title', 'user_input',
-            'precision_at_k', 'recall_at_k', 'mrr', 'ndcg',
-            'binary_genre_similarity', 'proportional_genre_similarity',
-            'top_k_ids', 'top_k_titles'
-        ])
+    rows = []
+    for _, row in df_input.iterrows():
+        original_id = str(row[ORIGINAL_ID_COL]).strip()
+        user_input = str(row[USER_INPUT_COL]).strip()
 
-        for _, row in df_input.iterrows():
-            original_id = str(row[ORIGINAL_ID_COL]).strip()
-            user_input = str(row[USER_INPUT_COL]).strip()
-            title = title_map.get(original_id, '')
+        if not user_input or not original_id or user_input.lower() == 'nan':
+            continue
 
-            if not user_input or not original_id or user_input.lower() == 'nan':
-                continue
+        recommendations = get_recommendations(user_input)
+        if not recommendations:
+            continue
 
-            recommendations = get_recommendations(user_input)
-            if not recommendations:
-                continue
+        rows.append((original_id, user_input, recommendations))
 
-            input_genres = genre_map.get(original_id, [])
+    total = len(rows)
+    if total == 0:
+        print("No valid inputs processed.")
+        return
 
-            if not input_genres:
-                total_results_without_genres += 1
+    # All metrics for the whole (inputs x TOP_K) matrix at once
+    top_k_ids = pad_ids([[m.get('id', '') for m in recs] for _, _, recs in rows], TOP_K)
+    original_ids = [original_id for original_id, _, _ in rows]
 
-            total += 1
+    ranking = evaluate(top_k_ids, original_ids, ks=(TOP_K,))
+    precision = ranking[f'hit@{TOP_K}']
+    recall = ranking[f'hit@{TOP_K}']  # single relevant item: recall@k == hit@k
+    mrr = ranking[f'mrr@{TOP_K}']
+    ndcg = ranking[f'ndcg@{TOP_K}']
 
-            precision = precision_at_k(recommendations, original_id)
-            recall = recall_at_k(recommendations, original_id)
-            mrr = mrr_score(recommendations, original_id)
-            ndcg = ndcg_score(recommendations, original_id)
+    input_masks = genre_index.masks_for(original_ids)
+    binary_scores, prop_scores = genre_scores(input_masks, genre_index.masks_for(top_k_ids))
 
-            bin_score = None
-            prop_score = None
-            if input_genres:
-                bin_score = genre_binary_score(input_genres, recommendations[:TOP_K])
-                prop_score = genre_proportional_score(input_genres, recommendations[:TOP_K])
-                if bin_score is not None:
-                    binary_sum += bin_score
-                    prop_sum += prop_score
-                    genre_count += 1
+    with open(OUTPUT_RESULTS, 'w', newline='', encoding='utf-8-sig') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow([
+            'original_id', 'title', 'user_input',
+            'precision_at_k', 'recall_at_k', 'mrr', 'ndcg',
+            'binary_genre_similarity', 'proportional_genre_similarity',
+            'top_k_ids', 'top_k_titles'
+        ])
 
-            precision_sum += precision
-            recall_sum += recall
-            mrr_sum += mrr
-            ndcg_sum += ndcg
+        for i, (original_id, user_input, recommendations) in enumerate(rows):
+            bin_score = binary_scores[i]
+            prop_score = prop_scores[i]
 
             top_k_recs = recommendations[:TOP_K]
-            top_k_ids = ','.join(str(m.get('id', '')) for m in top_k_recs)
-            top_k_titles = ','.join(m.get('title', '').replace(',', '') for m in top_k_recs)
-
             writer.writerow([
                 original_id,
-                title,
+                title_map.get(original_id, ''),
                 user_input,
-                f'{precision:.6f}',
-                f'{recall:.6f}',
-                f'{mrr:.6f}',
-                f'{ndcg:.6f}',
-                f'{bin_score:.6f}' if bin_score is not None else '',
-                f'{prop_score:.6f}' if prop_score is not None else '',
-                top_k_ids,
-                top_k_titles
+                f'{precision[i]:.6f}',
+                f'{recall[i]:.6f}',
+                f'{mrr[i]:.6f}',
+                f'{ndcg[i]:.6f}',
+                f'{bin_score:.6f}' if not np.isnan(bin_score) else '',
+                f'{prop_score:.6f}' if not np.isnan(prop_score) else '',
+                ','.join(str(m.get('id', '')) for m in top_k_recs),
+                ','.join(m.get('title', '').replace(',', '') for m in top_k_recs)
             ])
 
-    if total == 0:
-        print("No valid inputs processed.")
-        return
+    scored = ~np.isnan(binary_scores)
+    genre_count = int(scored.sum())
 
     metrics_summary = {
-        'precision_at_k': precision_sum / total,
-        'recall_at_k': recall_sum / total,
-        'mrr': mrr_sum / total,
-        'ndcg': ndcg_sum / total,
-        'binary_genre_similarity': (binary_sum / genre_count) if genre_count > 0 else None,
-        'proportional_genre_similarity': (prop_sum / genre_count) if genre_count > 0 else None,
+        'precision_at_k': float(precision.mean()),
+        'recall_at_k': float(recall.mean()),
+        'mrr': float(mrr.mean()),
+        'ndcg': float(ndcg.mean()),
+        'binary_genre_similarity': float(binary_scores[scored].mean()) if genre_count > 0 else None,
+        'proportional_genre_similarity': float(prop_scores[scored].mean()) if genre_count > 0 else None,
         'total_evaluated_inputs': total,
         'total_inputs_with_genres': genre_count,
-        'total_results_without_genres': total_results_without_genres
+        'total_results_without_genres': int((input_masks == 0).sum())
     }
 
     with open(OUTPUT_SUMMARY, 'w', encoding='utf-8') as f:
@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import argparse
+import hashlib
+import itertools
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'nlp'))
+from artifact_io import artifact_checksum, read_artifact
+from model_registry import DEFAULT_MODEL
+from genre_index import GenreIndex, genre_scores
+from hybrid_scorer import HybridScorer, top_k
+from ranking_metrics import evaluate
+
+# === CONFIG ===
+CSV_INPUT = '../../data/results/inputs.csv'
+MODEL_FILE = '../../data/model/model.json'
+TFIDF_FILE = '../../data/model/tfidf_vectors.json'
+CACHE_DIR = './sweep_cache'
+OUTPUT_LEADERBOARD = './sweep_leaderboard.csv'
+EMBEDDING_API_URL = 'http://127.0.0.1:5000/embed'
+EMBED_BATCH = 64
+USER_INPUT_COL = 'input_user'
+ORIGINAL_ID_COL = 'id'
+TOP_K = 5
+
+# Defaults mirror backend/src/recommender.js (WEIGHT_MINILM = 0.7, SIMILARITY_THRESHOLD = 0.3)
+WEIGHT_GRID = np.round(np.linspace(0.0, 1.0, 11), 2).tolist()
+THRESHOLD_GRID = [0.0, 0.1, 0.2, 0.3, 0.4, 0.5]
+
+# === Inputs ===
+def load_inputs(path=CSV_INPUT):
+    df = pd.read_csv(path, sep=",", quotechar='"', encoding="utf-8", dtype={ORIGINAL_ID_COL: str})
+    df[USER_INPUT_COL] = df[USER_INPUT_COL].astype(str).str.strip()
+    df[ORIGINAL_ID_COL] = df[ORIGINAL_ID_COL].astype(str).str.strip()
+    valid = (df[USER_INPUT_COL] != '') & (df[USER_INPUT_COL].str.lower() != 'nan') & (df[ORIGINAL_ID_COL] != '')
+    return df[valid].reset_index(drop=True)
+
+def fingerprint(*paths, model_name=''):
+    """Cache key: content hash of the inputs and both model artifacts, plus the
+    embedding model the queries are encoded with.
+
+    Artifacts written by artifact_io already carry a checksum of their
+    sections, so only legacy files are hashed in full.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(model_name.encode('utf-8'))
+    for path in paths:
+        checksum = artifact_checksum(path)
+        if checksum:
+            digest.update(checksum.encode('ascii'))
+            continue
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+# === Score matrices ===
+def embed_queries(queries, url=EMBEDDING_API_URL, batch_size=EMBED_BATCH, model=None, no_cache=False):
+    """Goes through the embedding service so query cleaning matches production.
+
+    Batches are requested as raw float32 (one contiguous row per text).
+    model: registry name served by embed_service.py (None = its default).
+    no_cache: bypass the service's vector cache, for timing runs.
+    """
+    chunks = []
+    for start in range(0, len(queries), batch_size):
+        payload = {'texts': queries[start:start + batch_size]}
+        if model:
+            payload['model'] = model
+        if no_cache:
+            payload['no_cache'] = True
+        body = json.dumps(payload).encode('utf-8')
+        req = urllib.request.Request(url, data=body, headers={
+            'Content-Type': 'application/json',
+            'Accept': 'application/octet-stream',
+        })
+        with urllib.request.urlopen(req, timeout=120) as resp:
+            dim = int(resp.headers['X-Embedding-Dim'])
+            chunks.append(np.frombuffer(resp.read(), dtype='<f4').reshape(-1, dim))
+    return np.vstack(chunks).astype(np.float32)
+
+def build_cache(cache_dir, embed_url):
+    """Computes both score matrices once; reruns with unchanged inputs reuse them"""
+    # Queries must be encoded by the same model as the artifact's embeddings;
+    # the service's default model may be a different one with the same dim
+    model = read_artifact(MODEL_FILE)
+    model_name = model.metadata.get('model_name', DEFAULT_MODEL)
+    key = fingerprint(CSV_INPUT, MODEL_FILE, TFIDF_FILE, model_name=model_name)
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('key') == key:
+            print(f"Using cached score matrices from {cache_dir}")
+            return meta
+
+    df_input = load_inputs()
+    queries = df_input[USER_INPUT_COL].tolist()
+
+    # Sections are hash-checked as they are read; a corrupt artifact aborts the sweep
+    tfidf = read_artifact(TFIDF_FILE)
+
+    # Same normalized matrices as the backend kernel; query TF-IDF mirrors tfidf.js
+    scorer = HybridScorer.from_artifacts(model, tfidf)
+    print(f"Embedding {len(queries)} queries with {model_name} via {embed_url}...")
+    dense = scorer.dense_scores(embed_queries(queries, embed_url, model=model_name))
+    print("Scoring TF-IDF...")
+    sparse = scorer.tfidf_scores(queries)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    np.save(os.path.join(cache_dir, 'dense.npy'), dense)
+    np.save(os.path.join(cache_dir, 'tfidf.npy'), sparse)
+
+    meta = {
+        'key': key,
+        'movie_ids': [str(m['id']) for m in model['movies']],
+        'movie_titles': [str(m['title']) for m in model['movies']],
+        'target_ids': df_input[ORIGINAL_ID_COL].tolist(),
+        'user_inputs': queries,
+    }
+    with open(meta_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    return meta
+
+# === Grid evaluation (runs in worker processes) ===
+_worker = {}
+
+def _init_worker(cache_dir, movie_ids, target_ids, input_masks, movie_masks):
+    # mmap: every worker shares the same pages instead of copying the matrices
+    _worker['dense'] = np.load(os.path.join(cache_dir, 'dense.npy'), mmap_mode='r')
+    _worker['tfidf'] = np.load(os.path.join(cache_dir, 'tfidf.npy'), mmap_mode='r')
+    _worker['movie_ids'] = np.asarray(movie_ids)
+    _worker['target_ids'] = np.asarray(target_ids)
+    _worker['input_masks'] = input_masks
+    _worker['movie_masks'] = movie_masks
+
+def _apply_threshold(idx, scores, threshold, k):
+    """Drops results below threshold, then scores the remaining top-k"""
+    w = _worker
+    kept = scores >= threshold
+    retrieved = np.where(kept, w['movie_ids'][idx], '')
+    rec_masks = np.where(kept, w['movie_masks'][idx], 0).astype(np.uint32)
+    ranking = evaluate(retrieved, w['target_ids'], ks=(k,))
+    binary, proportional = genre_scores(w['input_masks'], rec_masks)
+    return kept, retrieved, ranking, binary, proportional
+
+def evaluate_config(weight_minilm, thresholds, k=TOP_K):
+    """All thresholds for one weight share the same fused matrix and top-k"""
+    fused = weight_minilm * _worker['dense'] + (1.0 - weight_minilm) * _worker['tfidf']
+    idx, scores = top_k(fused, k)
+
+    rows = []
+    for threshold in thresholds:
+        kept, _, ranking, binary, proportional = _apply_threshold(idx, scores, threshold, k)
+        scored = ~np.isnan(binary)
+        rows.append({
+            'weight_minilm': weight_minilm,
+            'weight_tfidf': round(1.0 - weight_minilm, 6),
+            'threshold': threshold,
+            'precision_at_k': ranking[f'hit@{k}'].mean(),
+            'recall_at_k': ranking[f'hit@{k}'].mean(),
+            'mrr': ranking[f'mrr@{k}'].mean(),
+            'ndcg': ranking[f'ndcg@{k}'].mean(),
+            'binary_genre_similarity': binary[scored].mean() if scored.any() else np.nan,
+            'proportional_genre_similarity': proportional[scored].mean() if scored.any() else np.nan,
+            'empty_results': float((~kept).all(axis=1).mean()),
+            'total_evaluated_inputs': len(_worker['target_ids']),
+        })
+    return rows
+
+def per_input_results(meta, weight_minilm, threshold, k=TOP_K):
+    """Per-input rows in the recommender_metrics.py layout, readable by plot_metrics.py"""
+    fused = weight_minilm * _worker['dense'] + (1.0 - weight_minilm) * _worker['tfidf']
+    idx, scores = top_k(fused, k)
+    kept, retrieved, ranking, binary, proportional = _apply_threshold(idx, scores, threshold, k)
+
+    titles = np.asarray(meta['movie_titles'])[idx]
+    title_by_id = dict(zip(meta['movie_ids'], meta['movie_titles']))
+    return pd.DataFrame({
+        'original_id': meta['target_ids'],
+        'title': [title_by_id.get(i, '') for i in meta['target_ids']],
+        'user_input': meta['user_inputs'],
+        'precision_at_k': ranking[f'hit@{k}'],
+        'recall_at_k': ranking[f'hit@{k}'],
+        'mrr': ranking[f'mrr@{k}'],
+        'ndcg': ranking[f'ndcg@{k}'],
+        'binary_genre_similarity': binary,
+        'proportional_genre_similarity': proportional,
+        'top_k_ids': [','.join(i for i in row if i) for row in retrieved],
+        'top_k_titles': [','.join(t.replace(',', '') for t, keep in zip(row, keep_row) if keep)
+                         for row, keep_row in zip(titles, kept)],
+    })
+
+# === Main ===
+def run_sweep(args):
+    meta = build_cache(args.cache_dir, args.embed_url)
+
+    genre_index = GenreIndex.from_catalog()
+    movie_masks = genre_index.masks_for(meta['movie_ids'])
+    input_masks = genre_index.masks_for(meta['target_ids'])
+    init_args = (args.cache_dir, meta['movie_ids'], meta['target_ids'], input_masks, movie_masks)
+
+    print(f"Evaluating {len(args.weights)} weights x {len(args.thresholds)} thresholds "
+          f"on {len(meta['target_ids'])} inputs with {args.workers or os.cpu_count()} workers...")
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=init_args) as pool:
+        futures = [pool.submit(evaluate_config, w, args.thresholds, args.k) for w in args.weights]
+        rows = list(itertools.chain.from_iterable(f.result() for f in futures))
+
+    leaderboard = (pd.DataFrame(rows)
+                   .sort_values(['ndcg', 'precision_at_k'], ascending=False)
+                   .reset_index(drop=True))
+    leaderboard.insert(0, 'rank', leaderboard.index + 1)
+    leaderboard.to_csv(args.output, index=False, float_format='%.6f', encoding='utf-8-sig')
+    print(leaderboard.head(10).to_string(index=False))
+    print(f"\nLeaderboard saved to {args.output}")
+
+    if args.best_results:
+        best = leaderboard.iloc[0]
+        _init_worker(*init_args)
+        per_input_results(meta, best['weight_minilm'], best['threshold'], args.k).to_csv(
+            args.best_results, index=False, float_format='%.6f', encoding='utf-8-sig')
+        print(f"Per-input results for the best configuration saved to {args.best_results}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Grid sweep of hybrid fusion weights and thresholds')
+    parser.add_argument('--weights', type=float, nargs='+', default=WEIGHT_GRID, help='values of WEIGHT_MINILM')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=THRESHOLD_GRID)
+    parser.add_argument('--k', type=int, default=TOP_K)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--cache-dir', default=CACHE_DIR)
+    parser.add_argument('--embed-url', default=EMBEDDING_API_URL)
+    parser.add_argument('--output', default=OUTPUT_LEADERBOARD)
+    parser.add_argument('--best-results', default=None,
+                        help='also write per-input results of the best configuration (plot_metrics.py format)')
+    run_sweep(parser.parse_args())